@@ -1,14 +1,22 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+import asyncio
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Any, Optional
 import os
 import sys
 
+from fast_json import FastJSONResponse, TimedRoute, get_serialization_stats
+from genres import GenreTable
+from health import HealthProber
+from rate_limit import TMDBRateLimitError
 from redis_client import RedisClient
-from tmdb_utils import TMDBClient
+from tmdb_cache import TMDBResponseCache, fingerprint
+from tmdb_utils import STALE_ELIGIBLE_ERRORS, TMDBClient
 
 # CORS 허용 도메인 설정
 ALLOWED_ORIGINS = os.getenv('CORS_ORIGINS', '').split(',') if os.getenv('CORS_ORIGINS') else [
@@ -18,11 +26,28 @@ ALLOWED_ORIGINS = os.getenv('CORS_ORIGINS', '').split(',') if os.getenv('CORS_OR
     "*"  # 개발 편의를 위해 모든 도메인 허용
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공유 HTTP 클라이언트 생성 및 정리, 헬스 프로버/장르 갱신 시작/중지"""
+    await tmdb_client.start()
+    await genre_table.refresh()
+    genre_table.start()
+    for prober in health_probers.values():
+        prober.start()
+    yield
+    for prober in health_probers.values():
+        await prober.stop()
+    await genre_table.stop()
+    await tmdb_client.close()
+
 app = FastAPI(
     title="OpusCine API Server", 
     version="1.0.1",
-    description="TMDB API와 Redis를 활용한 영화 데이터 관리 서버"
+    description="TMDB API와 Redis를 활용한 영화 데이터 관리 서버",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse  # orjson 직렬화 + 직렬화 시간 측정
 )
+app.router.route_class = TimedRoute  # 직렬화 시간에 FastAPI 응답 검증/변환 단계 포함
 
 # CORS 미들웨어 설정
 app.add_middleware(
@@ -35,7 +60,34 @@ app.add_middleware(
 
 # 클라이언트 초기화
 redis_client = RedisClient()
-tmdb_client = TMDBClient()
+tmdb_client = TMDBClient(cache=TMDBResponseCache(redis_client))
+
+# 헬스 프로버 (백그라운드 주기 확인, /health는 캐시된 상태로 응답)
+HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', 30))
+HEALTH_PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', 5))
+HEALTH_STATUS_LABELS = {"up": "connected", "down": "disconnected", "unknown": "unknown"}
+
+health_probers: Dict[str, HealthProber] = {
+    "tmdb_api": HealthProber(
+        "tmdb_api", tmdb_client.test_connection,
+        interval=HEALTH_PROBE_INTERVAL, timeout=HEALTH_PROBE_TIMEOUT
+    ),
+    # 동기 Redis 클라이언트는 이벤트 루프를 막지 않도록 스레드에서 ping
+    "redis": HealthProber(
+        "redis", lambda: asyncio.to_thread(redis_client.ping),
+        interval=HEALTH_PROBE_INTERVAL, timeout=HEALTH_PROBE_TIMEOUT
+    ),
+}
+
+# 장르 테이블 (시작 시 로드, 메모리 상주, 백그라운드 조건부 갱신)
+GENRE_REFRESH_INTERVAL = float(os.getenv('GENRE_REFRESH_INTERVAL', 24 * 60 * 60))
+GENRES_CACHE_MAX_AGE = int(os.getenv('GENRES_CACHE_MAX_AGE', 3600))
+genre_table = GenreTable(
+    tmdb_client.fetch_genres,
+    refresh_interval=GENRE_REFRESH_INTERVAL,
+    retry_min=float(os.getenv('GENRE_RETRY_MIN', 60)),
+    retry_max=float(os.getenv('GENRE_RETRY_MAX', 30 * 60))
+)
 
 # 추가 서비스 URL 설정 (환경변수에서 로드)
 PROXY_SERVER_URL = os.getenv('PROXY_SERVER_URL', 'YOUR_API_URL')
@@ -48,6 +100,9 @@ REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '60'))
 
 class TMDBQueryRequest(BaseModel):
     parameters: Dict[str, Any]
+    # 지정 시 limit개씩 나눈 page번째 구간을 TMDB 여러 페이지에서 모아 반환 (없으면 TMDB 한 페이지 그대로)
+    page: Optional[int] = Field(None, ge=1)
+    limit: Optional[int] = Field(None, ge=1, le=100)
     user_id: Optional[str] = None
     context: Optional[Dict[str, Any]] = None
     llm_metadata: Optional[Dict[str, Any]] = None
@@ -58,6 +113,21 @@ class TMDBQueryResponse(BaseModel):
     query_info: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+# /tmdb-query 응답의 영화 필드와 기본값 (TMDB 표준 형식, null도 기본값으로 대체)
+TMDB_MOVIE_DEFAULTS: Dict[str, Any] = {
+    "title": "", "original_title": "", "overview": "", "release_date": "",
+    "poster_path": "", "backdrop_path": "", "vote_average": 0, "vote_count": 0,
+    "popularity": 0, "genre_ids": [], "adult": False, "video": False, "original_language": ""
+}
+
+def sanitize_tmdb_movie(movie: Dict[str, Any], ott_links: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """TMDB 영화 → 응답용 dict (필드 선택 + None 기본값 처리 + OTT 링크를 한 번에)"""
+    return {
+        "id": movie["id"],
+        **{field: default if (value := movie.get(field)) is None else value for field, default in TMDB_MOVIE_DEFAULTS.items()},
+        "ott_links": ott_links or []
+    }
+
 @app.get("/")
 async def root():
     """헬스 체크 엔드포인트 (인증 불필요)"""
@@ -70,6 +140,7 @@ async def root():
             "health": "/health",
             "tmdb_query": "/tmdb-query",
             "movie_details": "/movie/{movie_id}",
+            "movie_full": "/movie/{movie_id}/full",
             "genres": "/genres",
             "admin": "/admin/*"
         },
@@ -83,14 +154,19 @@ async def query_movies(request: TMDBQueryRequest):
     ✅ 인증 불필요 (LLM 서버에서 간단 접근)
     
     LLM 서버 요구 형식 완전 지원:
-    - 요청: parameters, user_id, context, llm_metadata
+    - 요청: parameters, user_id, context, llm_metadata (+ 선택: page, limit)
     - 응답: data.results, query_info 구조
+    limit을 지정하면 필요한 TMDB 페이지(20개씩)를 동시에 조회해 병합 (페이지별 캐시)
     """
     start_time = datetime.now()
     
     try:
-        # 1. TMDB API 호출
-        tmdb_results = await tmdb_client.discover_movies(request.parameters)
+        # 1. TMDB API 호출 (정규화된 파라미터 기준 Redis 캐시 우선)
+        if request.limit is not None:
+            tmdb_results, cache_info = await tmdb_client.discover_movies_window(request.parameters, request.page or 1, request.limit)
+        else:
+            tmdb_results, cache_info = await tmdb_client.discover_movies_with_cache_info(request.parameters)
+        window_info = {"tmdb_pages": cache_info["tmdb_pages"], "partial": cache_info["partial"]} if "tmdb_pages" in cache_info else {}
         
         if not tmdb_results.get("results"):
             return TMDBQueryResponse(
@@ -103,7 +179,10 @@ async def query_movies(request: TMDBQueryRequest):
                 },
                 query_info={
                     "executed_at": start_time.isoformat(),
-                    "cache_hit": False,
+                    "cache_hit": cache_info["cache_hit"],
+                    "cache_age_seconds": cache_info["cache_age_seconds"],
+                    "stale": cache_info["stale"],
+                    **window_info,
                     "response_time_ms": int((datetime.now() - start_time).total_seconds() * 1000),
                     "user_id": request.user_id,
                     "context": request.context,
@@ -112,37 +191,16 @@ async def query_movies(request: TMDBQueryRequest):
                 error=None
             )
         
-        # 2. 각 영화에 OTT 링크 추가
-        enriched_movies = []
-        for movie in tmdb_results["results"]:
-            # Redis에서 OTT 링크 조회
-            ott_links = redis_client.get_ott_links(movie["id"])
-            
-            # 영화 정보에 OTT 링크 추가 (TMDB 표준 형식 유지)
-            movie_data = {
-                "id": movie["id"],
-                "title": movie.get("title", ""),
-                "original_title": movie.get("original_title", ""),
-                "overview": movie.get("overview", ""),
-                "release_date": movie.get("release_date", ""),
-                "poster_path": movie.get("poster_path", ""),
-                "backdrop_path": movie.get("backdrop_path", ""),
-                "vote_average": movie.get("vote_average", 0),
-                "vote_count": movie.get("vote_count", 0),
-                "popularity": movie.get("popularity", 0),
-                "genre_ids": movie.get("genre_ids", []),
-                "adult": movie.get("adult", False),
-                "video": movie.get("video", False),
-                "original_language": movie.get("original_language", ""),
-                "ott_links": ott_links or []
-            }
-            
-            enriched_movies.append(movie_data)
+        # 2. 각 영화에 OTT 링크 추가 (Redis MGET 한 번으로 페이지 전체 조회, 동기 클라이언트라 스레드에서 실행)
+        ott_links_by_id = await asyncio.to_thread(redis_client.get_ott_links_many, [movie["id"] for movie in tmdb_results["results"]])
         
-        # 캐시 히트 확인 (간단 구현)
-        cache_hit = False  # 추후 Redis 캐시 로직 추가 가능
+        enriched_movies = [
+            sanitize_tmdb_movie(movie, ott_links_by_id.get(movie["id"]))
+            for movie in tmdb_results["results"]
+        ]
         
-        return TMDBQueryResponse(
+        # 직접 구성한 응답이므로 재검증 없이 바로 직렬화
+        return FastJSONResponse(TMDBQueryResponse.model_construct(
             success=True,
             data={
                 "results": enriched_movies,
@@ -152,14 +210,17 @@ async def query_movies(request: TMDBQueryRequest):
             },
             query_info={
                 "executed_at": start_time.isoformat(),
-                "cache_hit": cache_hit,
+                "cache_hit": cache_info["cache_hit"],
+                "cache_age_seconds": cache_info["cache_age_seconds"],
+                "stale": cache_info["stale"],
+                **window_info,
                 "response_time_ms": int((datetime.now() - start_time).total_seconds() * 1000),
                 "user_id": request.user_id,
                 "context": request.context,
                 "llm_metadata": request.llm_metadata
             },
             error=None
-        )
+        ))
         
     except Exception as e:
         return TMDBQueryResponse(
@@ -184,7 +245,7 @@ async def get_movie_details(movie_id: int):
         movie_details = await tmdb_client.get_movie_details(movie_id)
         
         # Redis에서 OTT 링크 조회
-        ott_links = redis_client.get_ott_links(movie_id)
+        ott_links = await asyncio.to_thread(redis_client.get_ott_links, movie_id)
         
         # OTT 링크 추가
         movie_details["ott_links"] = ott_links or []
@@ -195,28 +256,101 @@ async def get_movie_details(movie_id: int):
             "timestamp": datetime.now().isoformat()
         }
         
+    except TMDBRateLimitError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"TMDB 요청이 많아 잠시 후 다시 시도해주세요: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after or 1))}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"영화 상세 정보 조회 중 오류 발생: {str(e)}"
         )
 
-@app.get("/genres")
-async def get_genres():
-    """TMDB 장르 목록 조회 ✅ 인증 불필요"""
+# /movie/{id}/full에서 상세 정보와 함께 한 번에 받는 TMDB 부가 정보
+MOVIE_FULL_APPEND = "credits,videos,similar"
+
+def movie_full_response(movie: Dict[str, Any], cache_hit: bool, cache_age: float, stale: bool) -> FastJSONResponse:
+    return FastJSONResponse({
+        "success": True,
+        "movie": movie,
+        "cache_hit": cache_hit,
+        "cache_age_seconds": round(cache_age, 3),
+        "stale": stale,
+        "timestamp": datetime.now().isoformat()
+    })
+
+@app.get("/movie/{movie_id}/full")
+async def get_movie_full(movie_id: int):
+    """
+    영화 상세 + 출연진(credits) + 영상(videos) + 비슷한 영화(similar) + OTT 링크 한 번에 조회 ✅ 인증 불필요
+    TMDB는 append_to_response로 한 번만 호출하고 그동안 Redis OTT 조회를 동시에 실행
+    조합된 결과 전체를 하나의 캐시 항목으로 저장 (TMDB 장애 시 TTL이 지난 항목으로 대신 응답)
+    """
+    cache = tmdb_client.cache
+    cache_key = fingerprint("movie_full", f"/movie/{movie_id}/full", {"append_to_response": MOVIE_FULL_APPEND})
+    cached = await cache.get("movie_full", cache_key) if cache is not None else None
+    if cached is not None and cached[2]:
+        return movie_full_response(cached[0], True, cached[1], False)
+    
     try:
-        genres = await tmdb_client.get_genres()
-        return {
-            "success": True,
-            "genres": genres,
-            "timestamp": datetime.now().isoformat()
-        }
-        
+        # 동기 Redis 조회는 스레드에서 실행해 TMDB 호출과 겹치게 함
+        movie, ott_links = await asyncio.gather(
+            tmdb_client.get_movie_full(movie_id, MOVIE_FULL_APPEND),
+            asyncio.to_thread(redis_client.get_ott_links, movie_id)
+        )
+    except STALE_ELIGIBLE_ERRORS as e:
+        if cached is not None:
+            cache.stale_served += 1
+            print(f"⚠️ TMDB 장애로 오래된 영화 전체 정보 응답 (movie_id: {movie_id}): {e}")
+            return movie_full_response(cached[0], True, cached[1], True)
+        if isinstance(e, TMDBRateLimitError):
+            raise HTTPException(
+                status_code=503,
+                detail=f"TMDB 요청이 많아 잠시 후 다시 시도해주세요: {str(e)}",
+                headers={"Retry-After": str(int(e.retry_after or 1))}
+            )
+        raise HTTPException(status_code=502, detail=f"영화 전체 정보 조회 중 오류 발생: {str(e)}")
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"장르 목록 조회 중 오류 발생: {str(e)}"
+            detail=f"영화 전체 정보 조회 중 오류 발생: {str(e)}"
         )
+    
+    movie["ott_links"] = ott_links or []
+    if cache is not None:
+        await cache.set("movie_full", cache_key, movie)
+    return movie_full_response(movie, False, 0, False)
+
+def genres_not_modified(request: Request) -> bool:
+    """클라이언트 캐시가 최신인지 (If-None-Match 우선, 없으면 If-Modified-Since)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or genre_table.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return genre_table.updated_at.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+@app.get("/genres")
+async def get_genres(request: Request):
+    """
+    TMDB 장르 목록 조회 ✅ 인증 불필요
+    메모리 장르 테이블에서 미리 만든 응답을 그대로 반환 (TMDB 호출 없음), ETag/Last-Modified로 304 지원
+    """
+    headers = {
+        "ETag": genre_table.etag,
+        "Last-Modified": genre_table.last_modified,
+        "Cache-Control": f"public, max-age={GENRES_CACHE_MAX_AGE}"
+    }
+    if genres_not_modified(request):
+        return Response(status_code=304, headers=headers)
+    return Response(content=genre_table.body, media_type="application/json", headers=headers)
 
 # 관리자 전용 엔드포인트 (서비스 토큰 필요)
 @app.post("/admin/init-redis")
@@ -261,22 +395,24 @@ async def initialize_redis():
         )
 
 @app.get("/health")
-async def health_check():
-    """상세 헬스 체크 (인증 불필요)"""
+async def health_check(deep: bool = False):
+    """
+    상세 헬스 체크 (인증 불필요)
+    Redis/TMDB 상태는 백그라운드 프로버가 기록한 값으로 즉시 응답, ?deep=1이면 지금 직접 확인
+    """
     try:
-        # Redis 연결 확인
-        redis_status = redis_client.ping()
-        
-        # TMDB API 연결 확인
-        tmdb_status = await tmdb_client.test_connection()
+        if deep:
+            await asyncio.gather(*(prober.probe_now() for prober in health_probers.values()))
         
         return {
             "service": "OpusCine API Server",
             "status": "running",
             "version": "1.0.1",
             "api_server": "running",
-            "redis": "connected" if redis_status else "disconnected",
-            "tmdb_api": "connected" if tmdb_status else "disconnected",
+            "redis": HEALTH_STATUS_LABELS[health_probers["redis"].status],
+            "tmdb_api": HEALTH_STATUS_LABELS[health_probers["tmdb_api"].status],
+            "upstreams": {name: prober.snapshot() for name, prober in health_probers.items()},
+            "deep": deep,
             "security": {
                 "api_key_required": False,
                 "cors_enabled": True,
@@ -306,6 +442,10 @@ async def admin_status():
                 "cors_origins": ALLOWED_ORIGINS
             },
             "redis_stats": stats,
+            "http_pool": tmdb_client.get_pool_stats(),
+            "tmdb_cache": tmdb_client.cache.get_stats(),
+            "genres": genre_table.get_stats(),
+            "serialization": get_serialization_stats(),
             "timestamp": datetime.now().isoformat()
         }
         
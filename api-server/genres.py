@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import fast_json
+
+# TMDB 연결 전/실패 시 사용하는 기본 장르 목록 (ko-KR)
+DEFAULT_GENRES: List[Dict[str, Any]] = [
+    {"id": 28, "name": "액션"}, {"id": 12, "name": "모험"}, {"id": 16, "name": "애니메이션"},
+    {"id": 35, "name": "코미디"}, {"id": 80, "name": "범죄"}, {"id": 99, "name": "다큐멘터리"},
+    {"id": 18, "name": "드라마"}, {"id": 10751, "name": "가족"}, {"id": 14, "name": "판타지"},
+    {"id": 36, "name": "역사"}, {"id": 27, "name": "공포"}, {"id": 10402, "name": "음악"},
+    {"id": 9648, "name": "미스터리"}, {"id": 10749, "name": "로맨스"}, {"id": 878, "name": "SF"},
+    {"id": 10770, "name": "TV 영화"}, {"id": 53, "name": "스릴러"}, {"id": 10752, "name": "전쟁"},
+    {"id": 37, "name": "서부"}
+]
+
+# (장르 목록, ETag, Last-Modified) 또는 변경 없음(304)이면 None
+GenreFetcher = Callable[[Optional[str], Optional[str]], Awaitable[Optional[Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]]]]
+
+
+class GenreTable:
+    """
+    메모리 상주 장르 테이블
+    시작 시 한 번 로드하고 refresh_interval마다 TMDB에 조건부 요청(If-None-Match/If-Modified-Since)으로 갱신
+    갱신에 실패하면 retry_min초부터 두 배씩(최대 retry_max초) 늘려 재시도하고, 성공하면 원래 주기로 복귀
+    /genres 응답 본문과 ETag는 갱신 시 미리 만들어 두어 요청 처리 중에는 I/O·직렬화가 없음
+    """
+
+    def __init__(self, fetch: GenreFetcher, refresh_interval: float = 24 * 60 * 60,
+                 retry_min: float = 60.0, retry_max: float = 30 * 60):
+        self._fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.consecutive_failures = 0
+        self.genres: List[Dict[str, Any]] = []
+        self.source = "default"
+        self.upstream_etag: Optional[str] = None
+        self.upstream_last_modified: Optional[str] = None
+        self.updated_at: Optional[datetime] = None
+        self.last_checked: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.etag = ""
+        self.body = b""
+        self._task: Optional[asyncio.Task] = None
+        self._replace(DEFAULT_GENRES, "default")
+
+    def _replace(self, genres: List[Dict[str, Any]], source: str):
+        """장르 목록/응답 본문/ETag를 한 번에 교체"""
+        updated_at = datetime.now(timezone.utc)
+        body = fast_json.dumps({
+            "success": True,
+            "genres": genres,
+            "genre_map": {genre["id"]: genre["name"] for genre in genres},
+            "source": source,
+            "timestamp": updated_at.isoformat()
+        })
+        self.genres = genres
+        self.source = source
+        self.updated_at = updated_at
+        self.body = body
+        self.etag = '"' + hashlib.sha1(fast_json.dumps(genres)).hexdigest()[:16] + '"'
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.updated_at, usegmt=True)
+
+    async def refresh(self) -> str:
+        """TMDB에서 조건부 갱신, "updated" / "not_modified" / "failed" 반환 (실패 시 기존 테이블 유지)"""
+        self.last_checked = datetime.now().isoformat()
+        started = time.perf_counter()
+        try:
+            result = await self._fetch(self.upstream_etag, self.upstream_last_modified)
+        except Exception as e:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(e)
+            print(f"⚠️ 장르 목록 갱신 실패 (기존 {self.source} 목록 유지): {e}")
+            return "failed"
+        if result is None:
+            self.not_modified += 1
+            self.consecutive_failures = 0
+            return "not_modified"
+
+        genres, etag, last_modified = result
+        if not genres:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = "빈 장르 목록"
+            return "failed"
+        self.upstream_etag = etag
+        self.upstream_last_modified = last_modified
+        self.last_error = None
+        self.consecutive_failures = 0
+        self.refreshes += 1
+        if genres != self.genres or self.source != "tmdb":
+            self._replace(genres, "tmdb")
+            print(f"✅ 장르 목록 갱신: {len(genres)}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return "updated"
+
+    def next_delay(self) -> float:
+        """다음 갱신까지 대기 (연속 실패 중이면 짧은 지수 백오프)"""
+        if self.consecutive_failures == 0:
+            return self.refresh_interval
+        return min(self.retry_max, self.retry_min * 2 ** (self.consecutive_failures - 1), self.refresh_interval)
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.next_delay())
+            await self.refresh()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "count": len(self.genres),
+            "etag": self.etag,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "last_checked": self.last_checked,
+            "refresh_interval_seconds": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "not_modified": self.not_modified,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "next_refresh_in_seconds": self.next_delay(),
+            "last_error": self.last_error
+        }
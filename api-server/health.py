@@ -0,0 +1,90 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class HealthProber:
+    """
+    업스트림 하나에 대한 백그라운드 헬스 프로버
+    interval마다 check()를 실행해 상태/지연 시간/마지막 상태 변경 시각을 기록하고,
+    /health는 이 상태를 그대로 응답 (deep 체크 시에만 probe_now()로 즉시 확인)
+    """
+
+    def __init__(self, name: str, check: Callable[[], Awaitable[bool]], interval: float, timeout: float):
+        self.name = name
+        self._check = check
+        self.interval = interval
+        self.timeout = timeout
+        self.status = "unknown"
+        self.latency_ms: Optional[float] = None
+        self.last_checked: Optional[str] = None
+        self.last_change: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.checks = 0
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def _run_check(self) -> str:
+        started = time.perf_counter()
+        error = None
+        try:
+            healthy = await asyncio.wait_for(self._check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timeout ({self.timeout}s)"
+        except Exception as e:
+            healthy, error = False, f"{type(e).__name__}: {e}"
+
+        now = datetime.now().isoformat()
+        status = "up" if healthy else "down"
+        self.latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.last_checked = now
+        self.last_error = error
+        self.checks += 1
+        self.consecutive_failures = 0 if healthy else self.consecutive_failures + 1
+        if status != self.status:
+            if self.status != "unknown" or not healthy:
+                print(f"🩺 {self.name} 상태 변경: {self.status} → {status} ({self.latency_ms}ms{', ' + error if error else ''})")
+            self.status = status
+            self.last_change = now
+        return status
+
+    async def probe_now(self) -> str:
+        """즉시 확인 (진행 중인 확인이 있으면 그 결과를 공유)"""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._run_check())
+        return await asyncio.shield(self._inflight)
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.probe_now()
+            except Exception as e:
+                print(f"⚠️ {self.name} 헬스 프로브 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "last_checked": self.last_checked,
+            "last_change": self.last_change,
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.last_error,
+            "checks": self.checks,
+            "interval_seconds": self.interval
+        }
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+class TMDBRateLimitError(Exception):
+    """요청 기한 안에 TMDB 호출 슬롯을 얻지 못했거나 429 재시도가 기한을 넘긴 경우"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    TMDB 호출 제한 (토큰 버킷 + 동시 요청 수 상한)
+    - rate: 초당 토큰 보충량, burst: 버킷 크기
+    - max_in_flight: 동시에 진행 중인 요청 수 상한
+    - 429를 받으면 pause()로 Retry-After 동안 모든 요청의 토큰 발급을 멈춤
+    기한(deadline, time.monotonic 기준) 안에 슬롯을 얻지 못하면 TMDBRateLimitError
+    """
+
+    def __init__(self, rate: float = 40.0, burst: int = 40, max_in_flight: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.max_in_flight_seen = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.retried = 0
+        self.wait_seconds_total = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def _take_token(self, deadline: float) -> bool:
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                wait = self._paused_until - now
+            else:
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    async def acquire(self, deadline: float):
+        """동시 요청 슬롯 + 토큰 획득 (기한 초과 시 TMDBRateLimitError)"""
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - started))
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise TMDBRateLimitError(f"TMDB 동시 요청 한도 초과 (최대 {self.max_in_flight}개)")
+        if not await self._take_token(deadline):
+            self._semaphore.release()
+            self.rejected += 1
+            raise TMDBRateLimitError(f"TMDB 요청 속도 한도 초과 (초당 {self.rate}회)", retry_after=max(0.0, self._paused_until - time.monotonic()) or None)
+
+        self.acquired += 1
+        self.wait_seconds_total += time.monotonic() - started
+        self.in_flight += 1
+        self.max_in_flight_seen = max(self.max_in_flight_seen, self.in_flight)
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def pause(self, seconds: float):
+        """429 Retry-After 동안 새 토큰 발급 중지 (버킷도 비움)"""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """재시도 대기 시간 (Retry-After가 있으면 그 값 + 지터, 없으면 지수 백오프 full jitter)"""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.2 + 0.1))
+        return random.uniform(0, min(8.0, 0.5 * (2 ** attempt)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "max_in_flight_seen": self.max_in_flight_seen,
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 2),
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "avg_wait_ms": round(self.wait_seconds_total / self.acquired * 1000, 2) if self.acquired else None
+        }
@@ -4,6 +4,8 @@ import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+import fast_json
+
 class RedisClient:
     """
     OTT 링크 데이터를 관리하는 Redis 클라이언트
@@ -40,13 +42,32 @@ class RedisClient:
             ott_data = self.redis_client.get(key)
             
             if ott_data:
-                return json.loads(ott_data)
+                return fast_json.loads(ott_data)
             return None
             
         except Exception as e:
             print(f"OTT 링크 조회 오류 (movie_id: {movie_id}): {e}")
             return None
     
+    def get_ott_links_many(self, movie_ids: List[int]) -> Dict[int, Optional[List[Dict[str, Any]]]]:
+        """
+        여러 영화의 OTT 링크를 MGET 한 번으로 조회
+        """
+        unique_ids = list(dict.fromkeys(movie_ids))
+        if not unique_ids:
+            return {}
+        
+        try:
+            values = self.redis_client.mget([f"movie:{movie_id}" for movie_id in unique_ids])
+            return {
+                movie_id: fast_json.loads(ott_data) if ott_data else None
+                for movie_id, ott_data in zip(unique_ids, values)
+            }
+            
+        except Exception as e:
+            print(f"OTT 링크 일괄 조회 오류 ({len(unique_ids)}개): {e}")
+            return {movie_id: None for movie_id in unique_ids}
+    
     def set_ott_links(self, movie_id: int, ott_links: List[Dict[str, Any]]) -> bool:
         """
         특정 영화의 OTT 링크 저장
@@ -120,13 +141,21 @@ class RedisClient:
             ott_data = self.redis_client.get(key)
             
             if ott_data:
-                return json.loads(ott_data)
+                return fast_json.loads(ott_data)
             return None
             
         except Exception as e:
             print(f"TV OTT 링크 조회 오류 (tv_id: {tv_id}): {e}")
             return None
     
+    def get_cached(self, key: str) -> Optional[str]:
+        """캐시 값 조회 (연결 오류는 호출 측에서 처리)"""
+        return self.redis_client.get(key)
+    
+    def set_cached(self, key: str, value: str, ttl: int):
+        """캐시 값 저장 (ttl초 후 만료)"""
+        self.redis_client.set(key, value, ex=ttl)
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Redis 통계 정보 조회
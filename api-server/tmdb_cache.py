@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import fast_json
+
+# 엔드포인트 종류별 캐시 유지 시간 (초)
+TMDB_CACHE_TTLS: Dict[str, int] = {
+    "discover": int(os.getenv('TMDB_CACHE_TTL_DISCOVER', 600)),
+    "search": int(os.getenv('TMDB_CACHE_TTL_SEARCH', 600)),
+    "popular": int(os.getenv('TMDB_CACHE_TTL_POPULAR', 1800)),
+    "movie": int(os.getenv('TMDB_CACHE_TTL_MOVIE', 24 * 60 * 60)),
+    "credits": int(os.getenv('TMDB_CACHE_TTL_CREDITS', 24 * 60 * 60)),
+    # /movie/{id}/full 조합 결과 (OTT 링크 포함이라 상세 정보보다 짧게)
+    "movie_full": int(os.getenv('TMDB_CACHE_TTL_MOVIE_FULL', 60 * 60)),
+}
+
+# 신선 TTL이 지난 뒤에도 TMDB 장애 시 대신 응답할 수 있도록 보관하는 시간 (초)
+TMDB_STALE_WINDOW = int(os.getenv('TMDB_STALE_WINDOW', 6 * 60 * 60))
+
+# 생략해도 같은 결과가 나오는 기본값 (키에서 제외해 같은 요청이 같은 키를 갖도록)
+DEFAULT_PARAMS: Dict[str, str] = {"language": "ko-KR", "page": "1"}
+ENDPOINT_DEFAULT_PARAMS: Dict[str, Dict[str, str]] = {
+    "discover": {"sort_by": "popularity.desc"},
+}
+# 키에 넣지 않는 파라미터
+EXCLUDED_PARAMS = {"api_key"}
+# 쉼표(AND)/파이프(OR)로 여러 값을 받는 파라미터 접두어 (값 순서는 결과에 영향 없음)
+MULTI_VALUE_PREFIXES = ("with_", "without_")
+
+
+def _normalize_scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _normalize_value(name: str, value: Any) -> str:
+    """리스트는 정렬/중복 제거 후 쉼표로, with_* 문자열은 구분자별 토큰을 정렬"""
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(sorted({_normalize_scalar(item) for item in value}))
+    text = _normalize_scalar(value)
+    if name.startswith(MULTI_VALUE_PREFIXES):
+        separator = "|" if "|" in text else ","
+        tokens = sorted({token.strip() for token in text.split(separator) if token.strip()})
+        return separator.join(tokens)
+    return text
+
+
+def canonical_params(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    병합된 요청 파라미터 → 정규화된 쿼리 문자열
+    api_key 제외, None/빈 값 제외, 기본값(language=ko-KR, page=1 등) 생략, 키 정렬
+    """
+    defaults = {**DEFAULT_PARAMS, **ENDPOINT_DEFAULT_PARAMS.get(endpoint, {})}
+    items = []
+    for name in sorted(params):
+        value = params[name]
+        if name in EXCLUDED_PARAMS or value is None or value == "" or value == []:
+            continue
+        normalized = _normalize_value(name, value)
+        if defaults.get(name) == normalized:
+            continue
+        items.append(f"{name}={normalized}")
+    return "&".join(items)
+
+
+def fingerprint(endpoint: str, path: str, params: Dict[str, Any]) -> str:
+    """TMDB 응답 Redis 키 (tmdb:{엔드포인트 종류}:{경로+정규화 파라미터 해시})"""
+    canonical = f"{path}?{canonical_params(endpoint, params)}"
+    return f"tmdb:{endpoint}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+
+class TMDBResponseCache:
+    """
+    TMDB 응답 Redis 캐시 (엔드포인트 종류별 TTL)
+    저장 형식: {"cached_at": 저장 시각, "data": TMDB 응답}
+    Redis에는 TTL + stale_window 동안 보관하고, TTL이 지난 항목은 TMDB 장애 시에만 사용 (stale-if-error)
+    redis_client는 동기 클라이언트이므로 조회/저장은 스레드에서 실행 (Redis 지연이 이벤트 루프를 막지 않도록)
+    """
+
+    def __init__(self, redis_client, enabled: Optional[bool] = None, stale_window: int = TMDB_STALE_WINDOW):
+        self.redis_client = redis_client
+        self.enabled = enabled if enabled is not None else os.getenv('TMDB_CACHE_ENABLED', 'true').lower() == 'true'
+        self.stale_window = stale_window
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stale_served = 0
+        self.stores = 0
+        self.errors = 0
+
+    def ttl_for(self, endpoint: str) -> int:
+        return TMDB_CACHE_TTLS.get(endpoint, 0)
+
+    async def get(self, endpoint: str, key: str) -> Optional[Tuple[Dict[str, Any], float, bool]]:
+        """(TMDB 응답, 저장 후 경과 초, 신선 여부) 또는 None"""
+        if not self.enabled:
+            return None
+        try:
+            cached = await asyncio.to_thread(self.redis_client.get_cached, key)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ TMDB 캐시 조회 실패 ({key}): {e}")
+            return None
+        if cached is None:
+            self.misses += 1
+            return None
+        envelope = fast_json.loads(cached)
+        age = max(0.0, time.time() - envelope["cached_at"])
+        fresh = age < self.ttl_for(endpoint)
+        if fresh:
+            self.hits += 1
+        else:
+            self.expired += 1
+        return envelope["data"], age, fresh
+
+    async def set(self, endpoint: str, key: str, data: Dict[str, Any]) -> bool:
+        ttl = self.ttl_for(endpoint)
+        if not self.enabled or ttl <= 0:
+            return False
+        try:
+            value = fast_json.dumps_str({"cached_at": time.time(), "data": data})
+            await asyncio.to_thread(self.redis_client.set_cached, key, value, ttl + self.stale_window)
+            self.stores += 1
+            return True
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ TMDB 캐시 저장 실패 ({key}): {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.expired
+        return {
+            "enabled": self.enabled,
+            "ttls": TMDB_CACHE_TTLS,
+            "stale_window_seconds": self.stale_window,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stale_served": self.stale_served,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "stores": self.stores,
+            "errors": self.errors
+        }
@@ -1,69 +1,307 @@
 import httpx
 import os
-from typing import Dict, List, Any, Optional
+import asyncio
+import time
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from rate_limit import RateLimiter, TMDBRateLimitError, parse_retry_after
+from tmdb_cache import TMDBResponseCache, fingerprint
+
+class TMDBUpstreamError(Exception):
+    """TMDB 서버 측 오류 (5xx) - 캐시된 응답으로 대신할 수 있는 장애"""
+
+
+# TMDB discover 한 페이지의 결과 수와 조회 가능한 최대 페이지
+TMDB_PAGE_SIZE = 20
+TMDB_MAX_PAGE = 500
+
+# 오래된 캐시로 대신 응답할 수 있는 오류 (4xx 응답은 제외)
+STALE_ELIGIBLE_ERRORS = (TMDBUpstreamError, TMDBRateLimitError, httpx.HTTPError)
+
+
 class TMDBClient:
     """
     TMDB API를 통해 영화 데이터를 조회하는 클라이언트
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[TMDBResponseCache] = None):
         self.api_key = os.getenv('TMDB_API_KEY', 'YOUR_API_KEY')
         self.base_url = "https://api.themoviedb.org/3"
         self.image_base_url = "https://image.tmdb.org/t/p/w500"
         
-    async def discover_movies(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        # 커넥션 풀 설정 (요청마다 TCP+TLS 핸드셰이크를 하지 않도록 클라이언트 재사용)
+        self.timeout = float(os.getenv('TMDB_TIMEOUT', 10.0))
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv('HTTP_MAX_CONNECTIONS', 100)),
+            max_keepalive_connections=int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20)),
+            keepalive_expiry=float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 30.0))
+        )
+        self.http2 = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+        self._client: Optional[httpx.AsyncClient] = None
+        self.request_count = 0
+        
+        # TMDB 응답 Redis 캐시 (없으면 매번 TMDB 호출)
+        self.cache = cache
+        
+        # TMDB 호출 속도/동시성 제한과 429 재시도 (요청당 기한 안에서만)
+        self.limiter = RateLimiter(
+            rate=float(os.getenv('TMDB_RATE_LIMIT', 40)),
+            burst=int(os.getenv('TMDB_RATE_BURST', 40)),
+            max_in_flight=int(os.getenv('TMDB_MAX_IN_FLIGHT', 20))
+        )
+        self.request_deadline = float(os.getenv('TMDB_REQUEST_DEADLINE', 15.0))
+        self.max_retries = int(os.getenv('TMDB_MAX_RETRIES', 3))
+        
+        # 오래된 캐시로 응답한 키의 백그라운드 재검증 (키별 하나만)
+        self.revalidate_delay = float(os.getenv('TMDB_REVALIDATE_DELAY', 10.0))
+        self._revalidations: Dict[str, asyncio.Task] = {}
+        self.revalidation_stats = {"scheduled": 0, "refreshed": 0, "failed": 0}
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """TMDB용 커넥션 풀 클라이언트 생성"""
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ HTTP2_ENABLED=true 이지만 h2 패키지가 없음 (pip install httpx[http2]) - HTTP/1.1 사용")
+                http2 = False
+        return httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=http2)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 httpx 클라이언트 반환 (start() 전에 호출되면 지연 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        self.request_count += 1
+        return self._client
+    
+    async def start(self):
+        """앱 시작 시 공유 클라이언트 생성"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+    
+    async def close(self):
+        """앱 종료 시 진행 중인 재검증 취소 및 공유 클라이언트 정리"""
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        self._revalidations.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 상태 조회 (httpcore 내부 풀 정보는 가능한 경우에만 포함)"""
+        stats: Dict[str, Any] = {
+            "active": self._client is not None and not self._client.is_closed,
+            "timeout": self.timeout,
+            "http2_enabled": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "requests": self.request_count,
+            "rate_limit": self.limiter.get_stats(),
+            "stale_revalidation": {**self.revalidation_stats, "pending": len(self._revalidations)}
+        }
+        try:
+            connections = self._client._transport._pool.connections if self._client else []
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+        except Exception:
+            pass
+        return stats
+        
+    async def _request(self, path: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None) -> httpx.Response:
         """
-        TMDB Discover API를 통해 영화 검색
+        속도 제한을 거친 TMDB GET 요청
+        429(및 Retry-After가 있는 503)는 Retry-After + 지터만큼 기다렸다가 재시도하되,
+        요청 기한(TMDB_REQUEST_DEADLINE)을 넘길 것 같으면 TMDBRateLimitError
         """
-        try:
-            # 기본 파라미터 설정
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR",
-                "sort_by": "popularity.desc",
-                "page": 1
-            }
-            
-            # 사용자 파라미터 병합
-            params.update(parameters)
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
+        deadline = deadline if deadline is not None else time.monotonic() + self.request_deadline
+        attempt = 0
+        while True:
+            await self.limiter.acquire(deadline)
+            try:
+                client = self._get_client()
                 response = await client.get(
-                    f"{self.base_url}/discover/movie",
-                    params=params
+                    f"{self.base_url}{path}",
+                    params={"api_key": self.api_key, **params},
+                    headers=headers,
+                    timeout=max(0.1, min(self.timeout, deadline - time.monotonic()))
                 )
+            finally:
+                self.limiter.release()
+            
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if response.status_code != 429 and not (response.status_code == 503 and retry_after is not None):
+                return response
+            
+            if response.status_code == 429:
+                self.limiter.pause(retry_after if retry_after is not None else 1.0)
+            delay = self.limiter.backoff_delay(attempt, retry_after)
+            if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                raise TMDBRateLimitError(f"TMDB 요청 한도 초과 ({response.status_code}, 재시도 {attempt}회)", retry_after=retry_after)
+            attempt += 1
+            self.limiter.retried += 1
+            await asyncio.sleep(delay)
+    
+    async def _fetch_json(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """TMDB 호출 후 응답 JSON 반환 (캐시 사용 안 함)"""
+        response = await self._request(path, params)
+        if response.status_code >= 500:
+            raise TMDBUpstreamError(f"TMDB API 오류: {response.status_code}")
+        if response.status_code != 200:
+            raise Exception(f"TMDB API 오류: {response.status_code}")
+        return response.json()
+    
+    async def _fetch_and_store(self, endpoint: str, cache_key: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """TMDB 호출 후 성공 응답을 캐시에 저장"""
+        data = await self._fetch_json(path, params)
+        if self.cache is not None:
+            await self.cache.set(endpoint, cache_key, data)
+        return data
+    
+    async def _revalidate(self, endpoint: str, cache_key: str, path: str, params: Dict[str, Any]):
+        await asyncio.sleep(self.revalidate_delay)
+        try:
+            await self._fetch_and_store(endpoint, cache_key, path, params)
+            self.revalidation_stats["refreshed"] += 1
+            print(f"✅ TMDB 캐시 재검증 완료 ({path})")
+        except Exception as e:
+            self.revalidation_stats["failed"] += 1
+            print(f"⚠️ TMDB 캐시 재검증 실패 ({path}): {e}")
+        finally:
+            self._revalidations.pop(cache_key, None)
+    
+    def _schedule_revalidation(self, endpoint: str, cache_key: str, path: str, params: Dict[str, Any]):
+        if cache_key in self._revalidations:
+            return
+        self.revalidation_stats["scheduled"] += 1
+        self._revalidations[cache_key] = asyncio.create_task(self._revalidate(endpoint, cache_key, path, params))
+    
+    async def _get_json(self, endpoint: str, path: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        TMDB GET 요청 (캐시 우선), (응답 JSON, 캐시 정보) 반환
+        캐시 키는 api_key를 제외하고 기본값을 생략한 정규화 파라미터로 생성
+        TMDB 장애(5xx/429/연결 오류) 시 신선 TTL이 지난 캐시가 남아 있으면 stale=True로 대신 응답하고 백그라운드 재검증
+        """
+        cache_key = fingerprint(endpoint, path, params)
+        cached = await self.cache.get(endpoint, cache_key) if self.cache is not None else None
+        if cached is not None and cached[2]:
+            data, age, _ = cached
+            return data, {"cache_hit": True, "cache_age_seconds": round(age, 3), "stale": False, "cache_key": cache_key}
+        
+        try:
+            data = await self._fetch_and_store(endpoint, cache_key, path, params)
+        except STALE_ELIGIBLE_ERRORS as e:
+            if cached is None:
+                raise
+            data, age, _ = cached
+            self.cache.stale_served += 1
+            self._schedule_revalidation(endpoint, cache_key, path, params)
+            print(f"⚠️ TMDB 장애로 오래된 캐시 응답 ({path}, {age:.0f}초 전): {e}")
+            return data, {"cache_hit": True, "cache_age_seconds": round(age, 3), "stale": True, "stale_reason": str(e), "cache_key": cache_key}
+        return data, {"cache_hit": False, "cache_age_seconds": 0, "stale": False, "cache_key": cache_key}
+    
+    async def discover_movies_with_cache_info(self, parameters: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        TMDB Discover API를 통해 영화 검색, (응답, 캐시 정보) 반환
+        """
+        try:
+            return await self._get_json("discover", "/discover/movie", self._discover_params(parameters))
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"영화 검색 실패: {str(e)}")
     
+    def _discover_params(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """기본 파라미터 설정 후 사용자 파라미터 병합"""
+        params = {
+            "language": "ko-KR",
+            "sort_by": "popularity.desc",
+            "page": 1
+        }
+        params.update(parameters)
+        params.pop("api_key", None)
+        return params
+    
+    async def discover_movies_window(self, parameters: Dict[str, Any], page: int, limit: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        limit개씩 나눈 page번째 구간을 TMDB discover 여러 페이지(20개씩)로 동시에 조회해 병합
+        - 필요한 TMDB 페이지만 계산해 호출 제한기 아래에서 동시 요청 (페이지별로 캐시)
+        - 정렬 순서를 유지하며 id 중복 제거 (페이지 사이에 순위가 바뀌어 겹치는 경우)
+        - 첫 페이지 이후 실패한 페이지가 있으면 그 앞까지만 사용 (partial=True)
+        (응답, 캐시 정보) 반환, 응답의 page/total_pages는 limit 기준
+        """
+        offset = (page - 1) * limit
+        first_page = offset // TMDB_PAGE_SIZE + 1
+        last_page = min((offset + limit - 1) // TMDB_PAGE_SIZE + 1, TMDB_MAX_PAGE)
+        params = self._discover_params(parameters)
+        if first_page > TMDB_MAX_PAGE:
+            return {"results": [], "page": page, "total_results": 0, "total_pages": 0}, {
+                "cache_hit": False, "cache_age_seconds": 0, "stale": False, "tmdb_pages": [], "partial": False
+            }
+        
+        tmdb_pages = list(range(first_page, last_page + 1))
+        outcomes = await asyncio.gather(
+            *(self._get_json("discover", "/discover/movie", {**params, "page": tmdb_page}) for tmdb_page in tmdb_pages),
+            return_exceptions=True
+        )
+        
+        fetched = []
+        for tmdb_page, outcome in zip(tmdb_pages, outcomes):
+            if isinstance(outcome, BaseException):
+                if not fetched:
+                    if isinstance(outcome, TMDBRateLimitError):
+                        raise outcome
+                    raise Exception(f"영화 검색 실패: {str(outcome)}")
+                print(f"⚠️ TMDB discover {tmdb_page}페이지 조회 실패, 앞 페이지까지만 사용: {outcome}")
+                break
+            fetched.append(outcome)
+        
+        seen = set()
+        merged = []
+        for data, _ in fetched:
+            for movie in data.get("results", []):
+                if movie.get("id") in seen:
+                    continue
+                seen.add(movie.get("id"))
+                merged.append(movie)
+        
+        skip = offset - (first_page - 1) * TMDB_PAGE_SIZE
+        total_results = min(fetched[0][0].get("total_results", len(merged)), TMDB_MAX_PAGE * TMDB_PAGE_SIZE)
+        cache_infos = [info for _, info in fetched]
+        return {
+            "results": merged[skip:skip + limit],
+            "page": page,
+            "total_results": total_results,
+            "total_pages": (total_results + limit - 1) // limit
+        }, {
+            "cache_hit": all(info["cache_hit"] for info in cache_infos),
+            "cache_age_seconds": max(info["cache_age_seconds"] for info in cache_infos),
+            "stale": any(info["stale"] for info in cache_infos),
+            "tmdb_pages": tmdb_pages[:len(fetched)],
+            "partial": len(fetched) < len(tmdb_pages)
+        }
+    
+    async def discover_movies(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        TMDB Discover API를 통해 영화 검색
+        """
+        data, _ = await self.discover_movies_with_cache_info(parameters)
+        return data
+    
     async def get_movie_details(self, movie_id: int) -> Dict[str, Any]:
         """
         특정 영화의 상세 정보 조회
         """
         try:
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR"
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/movie/{movie_id}",
-                    params=params
-                )
+            data, _ = await self._get_json("movie", f"/movie/{movie_id}", {"language": "ko-KR"})
+            return data
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"영화 상세 정보 조회 실패: {str(e)}")
     
@@ -72,73 +310,56 @@ class TMDBClient:
         영화 제목으로 검색
         """
         try:
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR",
-                "query": query,
-                "page": page
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/search/movie",
-                    params=params
-                )
+            data, _ = await self._get_json("search", "/search/movie", {"language": "ko-KR", "query": query, "page": page})
+            return data
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"영화 검색 실패: {str(e)}")
     
-    async def get_genres(self) -> List[Dict[str, Any]]:
+    async def fetch_genres(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]]:
         """
-        영화 장르 목록 조회
+        영화 장르 목록 조건부 조회 (If-None-Match / If-Modified-Since)
+        변경 없음(304)이면 None, 아니면 (장르 목록, ETag, Last-Modified)
         """
         try:
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR"
-            }
+            headers = {}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/genre/movie/list",
-                    params=params
-                )
+            response = await self._request("/genre/movie/list", {"language": "ko-KR"}, headers=headers)
+            
+            if response.status_code == 304:
+                return None
+            if response.status_code == 200:
+                return response.json().get("genres", []), response.headers.get("etag"), response.headers.get("last-modified")
+            raise Exception(f"TMDB API 오류: {response.status_code}")
                 
-                if response.status_code == 200:
-                    return response.json().get("genres", [])
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"장르 목록 조회 실패: {str(e)}")
     
+    async def get_genres(self) -> List[Dict[str, Any]]:
+        """
+        영화 장르 목록 조회
+        """
+        genres, _, _ = await self.fetch_genres()
+        return genres
+    
     async def get_popular_movies(self, page: int = 1) -> Dict[str, Any]:
         """
         인기 영화 목록 조회
         """
         try:
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR",
-                "page": page
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/movie/popular",
-                    params=params
-                )
+            data, _ = await self._get_json("popular", "/movie/popular", {"language": "ko-KR", "page": page})
+            return data
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"인기 영화 조회 실패: {str(e)}")
     
@@ -147,42 +368,36 @@ class TMDBClient:
         영화 출연진 및 제작진 정보 조회
         """
         try:
-            params = {
-                "api_key": self.api_key,
-                "language": "ko-KR"
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/movie/{movie_id}/credits",
-                    params=params
-                )
+            data, _ = await self._get_json("credits", f"/movie/{movie_id}/credits", {"language": "ko-KR"})
+            return data
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise Exception(f"TMDB API 오류: {response.status_code}")
-                    
+        except TMDBRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"영화 크레딧 조회 실패: {str(e)}")
     
+    async def get_movie_full(self, movie_id: int, append: str = "credits,videos,similar") -> Dict[str, Any]:
+        """
+        영화 상세 + 부가 정보를 append_to_response로 한 번에 조회 (캐시 사용 안 함, 호출 측에서 조합 결과를 캐시)
+        TMDB 장애(5xx/429/연결 오류)는 그대로 전달해 호출 측에서 오래된 캐시로 대신할 수 있게 함
+        """
+        try:
+            return await self._fetch_json(f"/movie/{movie_id}", {"language": "ko-KR", "append_to_response": append})
+                
+        except STALE_ELIGIBLE_ERRORS:
+            raise
+        except Exception as e:
+            raise Exception(f"영화 전체 정보 조회 실패: {str(e)}")
+    
     async def test_connection(self) -> bool:
         """
         TMDB API 연결 테스트
         """
         try:
-            params = {
-                "api_key": self.api_key
-            }
+            response = await self._request("/configuration", {}, deadline=time.monotonic() + 5.0)
+            
+            return response.status_code == 200
             
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/configuration",
-                    params=params
-                )
-                
-                return response.status_code == 200
-                
         except Exception as e:
             print(f"TMDB API 연결 테스트 실패: {e}")
             return False
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    프로세스 내 L1 캐시 (LRU + TTL)
+    크기 초과 시 가장 오래 사용되지 않은 항목부터 제거, 만료된 항목은 조회 시점에 제거
+    """
+
+    def __init__(self, max_size: int = 5000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class SingleFlight:
+    """
+    동일 키로 동시에 들어온 비동기 작업을 하나로 합치는 요청 병합기
+    첫 요청(leader)만 실제 작업을 실행하고, 진행 중에 들어온 요청은 같은 결과를 공유
+    작업은 별도 태스크로 실행되어 leader 요청이 취소되어도 나머지 요청에 영향을 주지 않음
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """(결과, 병합 여부) 반환"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        self.executions += 1
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task), False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "deduplicated": self.deduplicated
+        }
+
+
+class RedisCache:
+    """
+    프록시 서버용 Redis 캐시 클라이언트
+    요청 경로에서 이벤트 루프를 블로킹하지 않도록 모든 메서드는 비동기 인터페이스로 제공
+    - use_async=True: redis.asyncio + 커넥션 풀 (기본값)
+    - use_async=False: 동기 redis.Redis를 스레드 풀에서 실행
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        password: Optional[str],
+        db: int = 0,
+        use_async: bool = True,
+        max_connections: int = 50,
+        socket_timeout: float = 5.0
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.use_async = use_async
+        self.available = False
+
+        connection_kwargs = dict(
+            host=host,
+            port=port,
+            password=password or None,
+            db=db,
+            decode_responses=True,
+            socket_connect_timeout=socket_timeout,
+            socket_timeout=socket_timeout,
+            max_connections=max_connections
+        )
+        if use_async:
+            self._pool = aioredis.ConnectionPool(**connection_kwargs)
+            self._client = aioredis.Redis(connection_pool=self._pool)
+        else:
+            self._pool = redis.ConnectionPool(**connection_kwargs)
+            self._client = redis.Redis(connection_pool=self._pool)
+
+    @classmethod
+    def from_env(cls) -> "RedisCache":
+        """Cloudtype 환경 변수로 캐시 클라이언트 생성"""
+        return cls(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            password=os.getenv('REDIS_PASSWORD', 'YOUR_REDIS_PASSWORD'),
+            db=int(os.getenv('REDIS_DB', 0)),
+            use_async=os.getenv('REDIS_ASYNC', 'true').lower() == 'true',
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+            socket_timeout=float(os.getenv('REDIS_TIMEOUT', 5))
+        )
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        """백엔드 종류에 관계없이 Redis 명령을 비동기로 실행"""
+        if self.use_async:
+            return await getattr(self._client, method)(*args)
+        return await asyncio.to_thread(getattr(self._client, method), *args)
+
+    async def connect(self) -> bool:
+        """연결 확인 (ping) 후 사용 가능 여부 갱신"""
+        try:
+            self.available = bool(await self._call("ping"))
+        except Exception as e:
+            logger.warning(f"⚠️ Redis ping 실패: {e}")
+            self.available = False
+        return self.available
+
+    async def close(self):
+        """커넥션 풀 정리"""
+        if self.use_async:
+            await self._client.aclose()
+            await self._pool.disconnect()
+        else:
+            await asyncio.to_thread(self._client.close)
+            await asyncio.to_thread(self._pool.disconnect)
+        self.available = False
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._call("get", key)
+
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        return bool(await self._call("setex", key, ttl, value))
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """여러 키를 한 번의 왕복으로 조회 (MGET)"""
+        if not keys:
+            return []
+        return await self._call("mget", keys)
+
+    async def setex_many(self, entries: List[Tuple[str, int, str]]) -> bool:
+        """(key, ttl, value) 목록을 하나의 파이프라인으로 저장 (SETEX × N, 단일 왕복)"""
+        if not entries:
+            return True
+
+        def _fill(pipe):
+            for key, ttl, value in entries:
+                pipe.setex(key, ttl, value)
+            return pipe
+
+        if self.use_async:
+            async with self._client.pipeline(transaction=False) as pipe:
+                await _fill(pipe).execute()
+        else:
+            def _run():
+                with self._client.pipeline(transaction=False) as pipe:
+                    _fill(pipe).execute()
+            await asyncio.to_thread(_run)
+        return True
+
+    async def info(self) -> Dict[str, Any]:
+        return await self._call("info")
+
+    async def dbsize(self) -> int:
+        return await self._call("dbsize")
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 상태"""
+        stats: Dict[str, Any] = {
+            "backend": "redis.asyncio" if self.use_async else "redis (thread pool)",
+            "max_connections": self._pool.max_connections
+        }
+        try:
+            stats["in_use_connections"] = len(self._pool._in_use_connections)
+            stats["available_connections"] = len(self._pool._available_connections)
+        except Exception:
+            pass
+        return stats
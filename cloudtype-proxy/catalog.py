@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+로컬 카탈로그(영화/TV JSON) 로더 및 스냅샷 컴파일러
+
+JSON 원본을 OTT 조회에 필요한 최소 필드 + 정규화된 OTT 페이로드 + ID 인덱스로 변환하고,
+빌드 시점에 바이너리 스냅샷(pickle)으로 저장해 콜드 스타트 시 json.load 비용을 줄입니다.
+
+사용법:
+    python catalog.py compile          # 스냅샷 생성
+    python catalog.py bench            # JSON 로드 vs 스냅샷 로드 시간/메모리 비교
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MOVIES_DATA_FILE = os.getenv('MOVIES_DATA_FILE', 'data/movie/tmdb_movies_hybrid_final.json')
+TV_DATA_FILE = os.getenv('TV_DATA_FILE', 'data/tv series/tmdb_tv_series_final.json')
+CATALOG_SNAPSHOT_FILE = os.getenv('CATALOG_SNAPSHOT_FILE', 'data/catalog.snapshot')
+
+SNAPSHOT_VERSION = 2
+
+# 스냅샷에 남기는 필드 (원본 ott_links/ott_providers 등은 제외, overview는 대체 추천 응답용)
+CATALOG_FIELDS = (
+    "tmdb_id", "id", "title", "name", "original_name", "genres",
+    "release_date", "first_air_date", "vote_average", "poster_path", "overview"
+)
+
+# OTT 링크 도메인 키워드 (정규화된 provider 이름에 포함되는 문자열)
+OTT_LINK_KEYWORDS = ("netflix", "wavve", "watcha", "disneyplus", "amazon", "apple", "tving", "coupang")
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 RSS (MB, Linux는 /proc, 그 외는 최대 RSS로 대체)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    except Exception:
+        return 0.0
+
+
+def build_id_index(records: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """레코드 목록으로 ID → 레코드 인덱스 생성 (먼저 나온 레코드 우선)"""
+    index: Dict[int, Dict[str, Any]] = {}
+    for record in records:
+        for key in ("tmdb_id", "id"):
+            record_id = record.get(key)
+            if record_id is not None:
+                index.setdefault(record_id, record)
+    return index
+
+
+def _normalize_provider_key(name: str) -> str:
+    """provider 이름 비교용 정규화 ('Disney Plus' -> 'disneyplus')"""
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def _match_provider(link: str, providers: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """링크 도메인과 가장 잘 맞는 provider 선택 (이름이 가장 짧은 후보 우선: Netflix > Netflix Standard with Ads)"""
+    lower_link = link.lower()
+    keyword = next((k for k in OTT_LINK_KEYWORDS if k in lower_link), None)
+    if keyword is None:
+        return None
+    candidates = [p for p in providers if keyword in _normalize_provider_key(p.get("provider_name", ""))]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda p: len(p.get("provider_name", "")))
+
+
+def normalize_ott_payload(record: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """
+    ott_links(문자열 URL)와 ott_providers를 병합하여 최종 OTT 응답 형태로 변환
+    로딩 시 한 번만 실행되며, 결과는 요청 간에 공유되는 불변 튜플
+    provider 이름/타입/지역 문자열은 intern하여 모든 작품이 같은 객체를 공유
+    """
+    providers = record.get("ott_providers") or []
+    payload = []
+    for i, link in enumerate(record.get("ott_links") or []):
+        if isinstance(link, str):
+            provider = _match_provider(link, providers)
+            formatted_link = {
+                "provider_name": sys.intern(provider["provider_name"]) if provider else "Unknown",
+                "provider_id": provider["provider_id"] if provider else i + 1,
+                "logo_path": "",
+                "display_priority": i + 1,
+                "link": link
+            }
+            if provider:
+                formatted_link["type"] = sys.intern(provider.get("type", ""))
+                formatted_link["region"] = sys.intern(provider.get("region", ""))
+            payload.append(formatted_link)
+        elif isinstance(link, dict):
+            # 이미 딕셔너리인 경우 그대로 사용
+            payload.append(dict(link))
+    return tuple(payload)
+
+
+def compact_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """원본 레코드를 카탈로그 필드 + 정규화된 OTT 페이로드만 남긴 레코드로 변환"""
+    compact = {field: record[field] for field in CATALOG_FIELDS if field in record}
+    if "genres" in compact:
+        compact["genres"] = tuple(sys.intern(genre) for genre in compact["genres"])
+    compact["ott_payload"] = normalize_ott_payload(record)
+    return compact
+
+
+def _read_json_records(path: Path, list_key: str) -> List[Dict[str, Any]]:
+    if not path.exists():
+        logger.warning(f"⚠️ 데이터 파일을 찾을 수 없음: {path}")
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get(list_key, [])
+
+
+def _file_sha1(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _source_signature(path: Path) -> Optional[Dict[str, Any]]:
+    """원본 파일 변경 감지용 (크기, mtime, 내용 해시)"""
+    try:
+        stat = path.stat()
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "sha1": _file_sha1(path)}
+    except OSError:
+        return None
+
+
+def _source_unchanged(path: Path, recorded: Optional[Dict[str, Any]]) -> bool:
+    """크기/mtime이 같으면 바로 통과, mtime만 다르면(체크아웃 등) 내용 해시로 확인"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return recorded is None
+    if not recorded or stat.st_size != recorded["size"]:
+        return False
+    if stat.st_mtime == recorded["mtime"]:
+        return True
+    return _file_sha1(path) == recorded["sha1"]
+
+
+def sources_unchanged(recorded: Optional[Dict[str, Any]], paths: Dict[str, Path]) -> bool:
+    """기록된 원본 서명({"movies": ..., "tv_shows": ...})이 현재 JSON 파일과 같은지 (없는 파일은 비교하지 않음)"""
+    recorded = recorded or {}
+    return all(not path.exists() or _source_unchanged(path, recorded.get(name)) for name, path in paths.items())
+
+
+def content_version(sources: Optional[Dict[str, Any]]) -> str:
+    """원본 JSON 내용 해시로 만든 카탈로그 버전 (같은 원본이면 워커/재시작과 무관하게 같은 값)"""
+    digests = [((sources or {}).get(name) or {}).get("sha1", "") for name in ("movies", "tv_shows")]
+    return hashlib.sha1(":".join(digests).encode("utf-8")).hexdigest()[:12]
+
+
+def compile_catalog(movie_path: Path, tv_path: Path) -> Dict[str, Any]:
+    """JSON 원본 → 카탈로그 (압축 레코드 + ID 인덱스)"""
+    movies = [compact_record(record) for record in _read_json_records(movie_path, "movies")]
+    tv_shows = [compact_record(record) for record in _read_json_records(tv_path, "tv_series")]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "sources": {
+            "movies": _source_signature(movie_path),
+            "tv_shows": _source_signature(tv_path)
+        },
+        "movies": movies,
+        "tv_shows": tv_shows,
+        "movie_index": build_id_index(movies),
+        "tv_index": build_id_index(tv_shows)
+    }
+
+
+def save_snapshot(catalog: Dict[str, Any], snapshot_path: Path) -> int:
+    """카탈로그를 바이너리 스냅샷으로 저장 (임시 파일 후 교체), 파일 크기 반환"""
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path.stat().st_size
+
+
+def load_snapshot(snapshot_path: Path, movie_path: Path, tv_path: Path) -> Optional[Dict[str, Any]]:
+    """스냅샷 로드 (없거나, 버전이 다르거나, 원본 JSON 내용이 바뀌었으면 None)"""
+    if not snapshot_path.exists():
+        return None
+    try:
+        with open(snapshot_path, 'rb') as f:
+            catalog = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"⚠️ 카탈로그 스냅샷 로드 실패 ({snapshot_path}): {e}")
+        return None
+
+    if catalog.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"⚠️ 카탈로그 스냅샷 버전 불일치 ({catalog.get('version')} != {SNAPSHOT_VERSION}) - JSON 사용")
+        return None
+    if not sources_unchanged(catalog.get("sources"), {"movies": movie_path, "tv_shows": tv_path}):
+        logger.warning("⚠️ 카탈로그 스냅샷이 원본 JSON과 다름 - JSON 사용")
+        return None
+    return catalog
+
+
+def load_catalog(
+    movie_path: Path = Path(MOVIES_DATA_FILE),
+    tv_path: Path = Path(TV_DATA_FILE),
+    snapshot_path: Path = Path(CATALOG_SNAPSHOT_FILE)
+) -> Dict[str, Any]:
+    """스냅샷 우선 로드, 없으면 JSON 원본에서 컴파일 (load_stats에 소요 시간/메모리 기록)"""
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+
+    catalog = load_snapshot(snapshot_path, movie_path, tv_path)
+    source = "snapshot"
+    if catalog is None:
+        catalog = compile_catalog(movie_path, tv_path)
+        source = "json"
+
+    catalog["load_stats"] = {
+        "source": source,
+        "load_seconds": round(time.perf_counter() - started, 4),
+        "rss_before_mb": round(rss_before, 1),
+        "rss_after_mb": round(current_rss_mb(), 1)
+    }
+    return catalog
+
+
+class Catalog:
+    """
+    프로세스 내 카탈로그 (불변, 재로드 시 새 객체를 만들어 참조만 교체)
+    kind는 "movie" 또는 "tv"
+    """
+
+    backend = "memory"
+
+    def __init__(self, data: Dict[str, Any], generation: int = 0):
+        self.generation = generation
+        self.built_at = time.time()
+        self.load_stats: Dict[str, Any] = data.get("load_stats", {})
+        self.version = content_version(data.get("sources"))
+        self._records = {"movie": data["movies"], "tv": data["tv_shows"]}
+        self._index = {"movie": data["movie_index"], "tv": data["tv_index"]}
+        # 영화 컬럼형 쿼리 엔진 (main.prepare_catalog에서 교체 전에 생성)
+        self.query_engine = None
+
+    def get(self, kind: str, record_id: int) -> Optional[Dict[str, Any]]:
+        return self._index[kind].get(record_id)
+
+    def count(self, kind: str) -> int:
+        return len(self._records[kind])
+
+    def record_at(self, kind: str, slot: int) -> Dict[str, Any]:
+        return self._records[kind][slot]
+
+    def records(self, kind: str) -> Iterator[Dict[str, Any]]:
+        return iter(self._records[kind])
+
+
+def _bench(movie_path: Path, tv_path: Path, snapshot_path: Path):
+    """JSON 원본 로드(기존 방식) / JSON 컴파일 / 스냅샷 로드 비교 (각각 별도 프로세스에서 측정)"""
+    import subprocess
+
+    script = (
+        "import json, time, sys; sys.path.insert(0, {here!r}); import catalog as c; from pathlib import Path\n"
+        "before = c.current_rss_mb(); t = time.perf_counter()\n"
+        "mode = {mode!r}\n"
+        "if mode == 'raw_json':\n"
+        "    data = (json.load(open({movie!r}, encoding='utf-8')), json.load(open({tv!r}, encoding='utf-8')))\n"
+        "elif mode == 'compile':\n"
+        "    data = c.compile_catalog(Path({movie!r}), Path({tv!r}))\n"
+        "else:\n"
+        "    data = c.load_snapshot(Path({snapshot!r}), Path({movie!r}), Path({tv!r}))\n"
+        "    assert data is not None, 'snapshot missing or stale'\n"
+        "print(f'{{time.perf_counter() - t:.4f}} {{c.current_rss_mb() - before:.1f}}')\n"
+    )
+    here = str(Path(__file__).resolve().parent)
+    for mode, label in (("raw_json", "JSON 원본 (기존)"), ("compile", "JSON → 카탈로그"), ("snapshot", "스냅샷")):
+        code = script.format(here=here, mode=mode, movie=str(movie_path), tv=str(tv_path), snapshot=str(snapshot_path))
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if output.returncode != 0:
+            print(f"❌ {label}: {output.stderr.strip().splitlines()[-1]}")
+            continue
+        seconds, rss_delta = output.stdout.split()
+        print(f"📊 {label:<16} 로드 {float(seconds) * 1000:8.1f}ms, RSS 증가 {float(rss_delta):6.1f}MB")
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OpusCine 로컬 카탈로그 스냅샷 컴파일러")
+    parser.add_argument("command", choices=["compile", "bench"])
+    parser.add_argument("--movies", default=MOVIES_DATA_FILE)
+    parser.add_argument("--tv", default=TV_DATA_FILE)
+    parser.add_argument("--output", default=CATALOG_SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    movie_path, tv_path, snapshot_path = Path(args.movies), Path(args.tv), Path(args.output)
+
+    if args.command == "compile":
+        started = time.perf_counter()
+        catalog = compile_catalog(movie_path, tv_path)
+        size = save_snapshot(catalog, snapshot_path)
+        print(f"✅ 카탈로그 스냅샷 생성: {snapshot_path} ({size / 1024:.1f}KB, "
+              f"영화 {len(catalog['movies'])}개, TV {len(catalog['tv_shows'])}개, "
+              f"{time.perf_counter() - started:.2f}초)")
+    else:
+        _bench(movie_path, tv_path, snapshot_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    업스트림 호출용 서킷 브레이커 (closed → open → half_open → closed)
+    - closed: 연속 실패(느린 호출 포함)가 failure_threshold에 도달하면 open
+    - open: reset_timeout 동안 호출을 막고 호출 측은 즉시 대체 경로 사용
+    - half_open: 시험 호출 half_open_max_calls건만 허용, 성공하면 closed / 실패하면 다시 open
+      결과 없이 끝난 시험 호출(취소 등)은 release()로 슬롯을 반환하고,
+      half_open_timeout 안에 결과가 기록되지 않으면 실패로 보고 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 10.0,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        half_open_timeout: float = 60.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_timeout = half_open_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_calls = 0
+        self.half_open_started_at: Optional[float] = None
+        self.latency_ewma: Optional[float] = None
+        self.last_failure: Optional[str] = None
+        self.successes = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        log = logger.warning if state == self.OPEN else logger.info
+        log(f"🔌 {self.name} 서킷 브레이커: {self.state} → {state} (연속 실패 {self.consecutive_failures}회)")
+        self.state = state
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+        if state != self.HALF_OPEN:
+            self.half_open_calls = 0
+            self.half_open_started_at = None
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (open 상태에서 reset_timeout이 지나면 half_open으로 전환해 시험 호출 허용)"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                if time.monotonic() - self.half_open_started_at > self.half_open_timeout:
+                    self.record_failure(f"half-open trial timeout ({self.half_open_timeout:.0f}s)")
+                self.rejected += 1
+                return False
+            if self.half_open_calls == 0:
+                self.half_open_started_at = time.monotonic()
+            self.half_open_calls += 1
+        return True
+
+    def release(self):
+        """결과를 기록하지 못하고 끝난 호출(취소 등)의 half_open 시험 슬롯 반환"""
+        if self.state == self.HALF_OPEN and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+            if self.half_open_calls == 0:
+                self.half_open_started_at = None
+
+    def _observe_latency(self, latency: float):
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+    def record_success(self, latency: float):
+        """성공 기록 (slow_call_seconds를 넘긴 호출은 응답은 쓰되 실패로 집계)"""
+        self._observe_latency(latency)
+        if latency > self.slow_call_seconds:
+            self.slow_calls += 1
+            self.record_failure(f"slow call ({latency:.1f}s)")
+            return
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._transition(self.CLOSED)
+
+    def record_failure(self, reason: str, latency: Optional[float] = None):
+        if latency is not None:
+            self._observe_latency(latency)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = reason
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._transition(self.OPEN)
+
+    def get_stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == self.OPEN and self.opened_at is not None:
+            retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "slow_call_seconds": self.slow_call_seconds,
+            "reset_timeout_seconds": self.reset_timeout,
+            "half_open_timeout_seconds": self.half_open_timeout,
+            "retry_in_seconds": retry_in,
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "last_failure": self.last_failure
+        }
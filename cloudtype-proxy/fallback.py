@@ -0,0 +1,85 @@
+"""
+LLM 서버 장애 시 사용하는 로컬 카탈로그 기반 대체 추천
+
+메시지에서 키워드(장르/연도/최신·고전/평점/정렬)를 뽑아 LLM과 같은 TMDB 파라미터 형식으로 만들고,
+카탈로그 쿼리 엔진(query_engine)으로 로컬 영화(genres, release_date, vote_average)를 필터링/정렬합니다.
+키워드 규칙은 llm-server의 규칙 기반 파싱(model.py _rule_based_parsing)과 같습니다.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from query_engine import GENRE_IDS
+
+# 메시지 키워드 → TMDB 장르 ID (별칭 포함)
+GENRE_KEYWORDS: Dict[str, int] = {
+    **{name.replace(" ", "").lower(): genre_id for name, genre_id in GENRE_IDS.items()},
+    "과학소설": 878, "느와르": 80, "멜로": 10749, "뮤지컬": 10402
+}
+
+RECENT_WORDS = ("최신", "최근", "새로운", "신작")
+CLASSIC_WORDS = ("오래된", "고전", "옛날")
+HIGH_RATING_WORDS = ("명작", "걸작", "평점높은", "좋은")
+LOW_RATING_WORDS = ("평점낮은", "별로인")
+
+
+def parse_recommend_keywords(message: str) -> Dict[str, Any]:
+    """추천 메시지 → TMDB discover 파라미터 (with_genres, primary_release_date.gte/lte, vote_average.gte/lte, sort_by)"""
+    text = message.lower().strip()
+    compact = text.replace(" ", "")
+    params: Dict[str, Any] = {"sort_by": "popularity.desc"}
+
+    genres = sorted({genre_id for keyword, genre_id in GENRE_KEYWORDS.items() if keyword in compact})
+    if genres:
+        params["with_genres"] = genres
+
+    years = re.findall(r'(\d{4})년?', text)
+    if years:
+        year = years[-1]
+        params["primary_release_date.gte"] = f"{year}-01-01"
+        params["primary_release_date.lte"] = f"{year}-12-31"
+
+    if any(word in text for word in RECENT_WORDS):
+        params["primary_release_date.gte"] = f"{datetime.now().year - 1}-01-01"
+    if any(word in text for word in CLASSIC_WORDS):
+        params["primary_release_date.lte"] = "2000-12-31"
+
+    if any(word in compact for word in HIGH_RATING_WORDS):
+        params["vote_average.gte"] = 7.0
+    elif any(word in compact for word in LOW_RATING_WORDS):
+        params["vote_average.lte"] = 5.0
+
+    if "인기" in text:
+        params["sort_by"] = "popularity.desc"
+    elif "평점" in text:
+        params["sort_by"] = "vote_average.desc"
+    elif any(word in text for word in ("최신순", "개봉순")):
+        params["sort_by"] = "release_date.desc"
+    return params
+
+
+def to_movie_payload(record: Dict[str, Any]) -> Dict[str, Any]:
+    """카탈로그 레코드 → MovieInfo 형식 (로컬에 없는 필드는 기본값)"""
+    record_id = record.get("tmdb_id") or record.get("id")
+    return {
+        "id": record_id,
+        "title": record.get("title", ""),
+        "original_title": record.get("title", ""),
+        "overview": record.get("overview") or "",
+        "release_date": record.get("release_date") or "",
+        "poster_path": record.get("poster_path") or "",
+        "backdrop_path": "",
+        "vote_average": record.get("vote_average") or 0.0,
+        "vote_count": 0,
+        "popularity": 0.0,
+        "genre_ids": [GENRE_IDS[name] for name in record.get("genres", ()) if name in GENRE_IDS],
+        "ott_links": list(record.get("ott_payload", ()))
+    }
+
+
+def recommend_from_catalog(catalog: Any, message: str, page: int, limit: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
+    """(추출된 파라미터, 현재 페이지 영화 목록, 전체 결과 수)"""
+    params = parse_recommend_keywords(message)
+    slots, total = catalog.query_engine.query(params, offset=(page - 1) * limit, limit=limit)
+    return params, [to_movie_payload(catalog.record_at("movie", slot)) for slot in slots], total
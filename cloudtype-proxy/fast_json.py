@@ -0,0 +1,119 @@
+"""
+빠른 JSON 직렬화 (응답 클래스 + Redis/SSE용 dumps/loads)
+
+- pydantic 모델: 검증 없이 pydantic-core 직렬화기로 바로 JSON 바이트 생성
+- dict/list: orjson (없거나 FAST_JSON_ENABLED=false면 표준 json)
+- 응답마다 직렬화 시간을 X-Serialization-Time-Ms 헤더로 붙이고 누적 통계 기록
+  (FAST_JSON_ENABLED=false로 표준 json과 전/후 비교 가능)
+
+헤더 값은 엔드포인트가 값을 반환한 시점부터 응답 본문이 만들어질 때까지의 시간입니다.
+TimedRoute를 쓰는 앱에서는 FastAPI의 response_model 검증/jsonable_encoder 단계까지 포함하고,
+엔드포인트가 FastJSONResponse를 직접 만들면 그 render() 시간만 잽니다 (FastAPI 직렬화 단계가 없음).
+
+서비스마다 별도 컨테이너로 빌드/배포되고 공유 패키지가 없어 세 서비스에 같은 파일을 둡니다.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pip install orjson 권장, 없으면 표준 json 사용
+    orjson = None
+
+FAST_JSON_ENABLED = os.getenv('FAST_JSON_ENABLED', 'true').lower() == 'true' and orjson is not None
+SERIALIZATION_HEADER = "X-Serialization-Time-Ms"
+
+serialization_stats: Dict[str, Any] = {"responses": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": None}
+
+# 엔드포인트가 값을 반환한 시각 (TimedRoute가 기록, 직렬화 시간 측정 시작점)
+_endpoint_returned_at: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("endpoint_returned_at", default=None)
+
+
+def dumps(obj: Any) -> bytes:
+    """dict/list → JSON 바이트 (한글은 이스케이프하지 않음, int 키 허용)"""
+    if FAST_JSON_ENABLED:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    if FAST_JSON_ENABLED:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse 대체 응답 클래스
+    엔드포인트가 pydantic 모델을 그대로 넘기면 FastAPI의 재검증/dict 변환 없이 한 번에 직렬화
+    """
+
+    def __init__(self, content: Any, status_code: int = 200, **kwargs):
+        started = _endpoint_returned_at.get() or time.perf_counter()
+        _endpoint_returned_at.set(None)
+        super().__init__(content, status_code, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.headers[SERIALIZATION_HEADER] = f"{elapsed_ms:.3f}"
+
+        serialization_stats["responses"] += 1
+        serialization_stats["bytes"] += len(self.body)
+        serialization_stats["total_ms"] += elapsed_ms
+        serialization_stats["last_ms"] = round(elapsed_ms, 3)
+        if elapsed_ms > serialization_stats["max_ms"]:
+            serialization_stats["max_ms"] = elapsed_ms
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            if FAST_JSON_ENABLED:
+                return type(content).__pydantic_serializer__.to_json(content)
+            content = content.model_dump(mode="json")
+        return dumps(content)
+
+
+class TimedRoute(APIRoute):
+    """
+    엔드포인트 반환 시각을 기록하는 라우트 클래스 (app.router.route_class = TimedRoute)
+    FastJSONResponse가 FastAPI의 응답 검증/변환 단계까지 직렬화 시간에 포함하도록 함
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _mark_return(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        _endpoint_returned_at.set(None)
+        result = await endpoint(*args, **kwargs)
+        _endpoint_returned_at.set(time.perf_counter())
+        return result
+    return wrapper
+
+
+def get_serialization_stats() -> Dict[str, Any]:
+    responses = serialization_stats["responses"]
+    return {
+        "backend": "orjson" if FAST_JSON_ENABLED else "json",
+        "orjson_installed": orjson is not None,
+        "responses": responses,
+        "avg_ms": round(serialization_stats["total_ms"] / responses, 3) if responses else None,
+        "max_ms": round(serialization_stats["max_ms"], 3),
+        "last_ms": serialization_stats["last_ms"],
+        "avg_bytes": serialization_stats["bytes"] // responses if responses else None
+    }
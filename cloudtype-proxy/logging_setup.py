@@ -0,0 +1,240 @@
+"""
+프록시 서버 로깅 파이프라인 (논블로킹 큐 기반)
+
+요청 처리 스레드(이벤트 루프)는 레코드를 큐에 넣기만 하고, 포맷팅과 콘솔/파일 쓰기는
+QueueListener 스레드에서 처리합니다.
+
+- 경로별 샘플링: LOG_SAMPLE_RATES="/health=0.01,/api/movies=0.1" (WARNING 미만만 샘플링)
+- 반복 경고 제한: 같은 위치의 WARNING 이상은 LOG_RATE_LIMIT_WINDOW초마다 LOG_RATE_LIMIT_BURST건까지만 출력
+- 출력 형식: LOG_FORMAT=text|json
+- 런타임 레벨 변경: set_log_level()
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 현재 요청 경로 (RouteContextMiddleware가 설정, 샘플링/JSON 출력에 사용)
+current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_route", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional[queue.Queue] = None
+_filters: Dict[str, logging.Filter] = {}
+_traceback_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (ts, level, logger, message, route, exc_info), traceback은 TracebackQueueHandler가 남긴 exc_text 사용"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        route = getattr(record, "route", None)
+        if route:
+            entry["route"] = route
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler.prepare는 traceback까지 메시지에 합쳐 버려 JSON 포맷터가 exc_info를 구분할 수 없음
+    메시지 인자만 병합하고 traceback은 문자열(exc_text)로 남겨 리스너 쪽 포맷터가 처리하게 함
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RouteSamplingFilter(logging.Filter):
+    """
+    요청 경로별 샘플링 (가장 긴 prefix 규칙 적용)
+    WARNING 이상은 항상 통과, 레코드에 route 속성을 붙여 리스너 스레드에서도 사용 가능하게 함
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, float]:
+        rates: Dict[str, float] = {}
+        for part in spec.split(","):
+            if "=" not in part:
+                continue
+            prefix, rate = part.rsplit("=", 1)
+            try:
+                rates[prefix.strip()] = min(1.0, max(0.0, float(rate)))
+            except ValueError:
+                continue
+        return rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route = current_route.get()
+        record.route = route
+        if route is None or record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if route.startswith(prefix):
+                if rate >= 1.0 or random.random() < rate:
+                    return True
+                self.sampled_out += 1
+                return False
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    같은 위치(logger, 파일, 줄)에서 반복되는 WARNING 이상 로그를 창(window)마다 burst건으로 제한
+    다음으로 출력되는 레코드에 생략된 건수를 붙임
+    """
+
+    def __init__(self, window: float = 60.0, burst: int = 5):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._state: Dict[Tuple[str, str, int], List[float]] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                pending = int(state[2]) if state else 0
+                self._state[key] = [now, 1, 0]
+                if pending:
+                    record.suppressed = pending
+                    record.msg = f"{record.msg} (최근 {self.window:.0f}초간 동일 로그 {pending}건 생략)"
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class RouteContextMiddleware:
+    """요청 경로를 contextvar에 기록하는 경량 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = current_route.set(scope.get("path"))
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
+
+
+def setup_logging(log_file: Optional[str] = 'proxy_server.log') -> logging.handlers.QueueListener:
+    """
+    루트 로거를 QueueHandler 하나로 교체하고, 실제 출력 핸들러는 리스너 스레드에서 실행
+    여러 번 호출해도 한 번만 설정
+    """
+    global _listener, _queue
+    if _listener is not None:
+        return _listener
+
+    formatter: logging.Formatter
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _queue = queue.Queue(-1)
+    queue_handler = TracebackQueueHandler(_queue)
+    _filters["sampling"] = RouteSamplingFilter(RouteSamplingFilter.parse(os.getenv('LOG_SAMPLE_RATES', '')))
+    _filters["rate_limit"] = RateLimitFilter(
+        window=float(os.getenv('LOG_RATE_LIMIT_WINDOW', 60)),
+        burst=int(os.getenv('LOG_RATE_LIMIT_BURST', 5))
+    )
+    queue_handler.addFilter(_filters["sampling"])
+    queue_handler.addFilter(_filters["rate_limit"])
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """큐에 남은 레코드를 모두 출력한 뒤 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def set_log_level(level: str, logger_name: Optional[str] = None) -> Dict[str, str]:
+    """런타임 로그 레벨 변경 (logger_name 없으면 루트), 변경 전/후 레벨 반환"""
+    level = level.upper()
+    if level not in logging.getLevelNamesMapping():
+        raise ValueError(f"알 수 없는 로그 레벨: {level}")
+    target = logging.getLogger(logger_name)
+    previous = logging.getLevelName(target.getEffectiveLevel())
+    target.setLevel(level)
+    return {"logger": logger_name or "root", "previous": previous, "level": level}
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    sampling = _filters.get("sampling")
+    rate_limit = _filters.get("rate_limit")
+    return {
+        "level": logging.getLevelName(logging.getLogger().level),
+        "format": os.getenv('LOG_FORMAT', 'text').lower(),
+        "queue_size": _queue.qsize() if _queue is not None else 0,
+        "sample_rates": dict(sampling.rates) if sampling else {},
+        "sampled_out": sampling.sampled_out if sampling else 0,
+        "rate_limited": rate_limit.suppressed if rate_limit else 0,
+        "rate_limit": {"window_seconds": rate_limit.window, "burst": rate_limit.burst} if rate_limit else {}
+    }
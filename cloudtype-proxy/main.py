@@ -1,293 +1,516 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 import httpx
-import json
-import redis
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Sequence
 import os
+import asyncio
 import logging
+import hashlib
+import time
+import itertools
+import unicodedata
 from datetime import datetime
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-# === 로깅 설정 ===
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('proxy_server.log')
-    ]
-)
+from cache import RedisCache, SingleFlight, TTLCache
+import fast_json
+from circuit_breaker import CircuitBreaker
+from fast_json import FastJSONResponse, TimedRoute, get_serialization_stats
+from fallback import recommend_from_catalog, to_movie_payload
+from health import HealthProber
+from query_engine import CatalogQueryEngine
+from logging_setup import RouteContextMiddleware, get_logging_stats, set_log_level, setup_logging
+from catalog import CATALOG_SNAPSHOT_FILE, MOVIES_DATA_FILE, TV_DATA_FILE, Catalog, load_catalog
+from shared_catalog import SharedCatalogStore
+
+# === 로깅 설정 (큐 기반 논블로킹, 경로별 샘플링/반복 경고 제한은 logging_setup 참고) ===
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # === 전역 변수 및 설정 ===
-# 로컬 JSON 데이터 캐시
-movie_data_cache: Optional[Dict[str, Any]] = None
-tv_data_cache: Optional[Dict[str, Any]] = None
-data_loaded: bool = False
+# 로컬 카탈로그 (catalog.Catalog 또는 공유 모드의 shared_catalog.MappedCatalog)
+# 영화/TV 레코드와 ID 인덱스(tmdb_id, id 모두 키)를 함께 보관하며, 재로드 시 참조만 교체
+local_catalog: Optional[Any] = None
+
+# 멀티 워커 공유 카탈로그 (mmap 세대 파일, 기본값: WEB_CONCURRENCY > 1이면 활성화)
+CATALOG_SHARED = os.getenv(
+    'CATALOG_SHARED', 'true' if int(os.getenv('WEB_CONCURRENCY', 1)) > 1 else 'false'
+).lower() == 'true'
+CATALOG_GENERATION_CHECK_INTERVAL = float(os.getenv('CATALOG_GENERATION_CHECK_INTERVAL', 2.0))
+
+# 카탈로그 핫 리로드 (원본 JSON mtime 감시 주기, 0이면 비활성화)
+CATALOG_WATCH_INTERVAL = float(os.getenv('CATALOG_WATCH_INTERVAL', 0))
+# 새 카탈로그 레코드 수가 기존 대비 이 비율 미만이면 잘린 파일로 보고 교체 거부
+CATALOG_RELOAD_MIN_RATIO = float(os.getenv('CATALOG_RELOAD_MIN_RATIO', 0.5))
+catalog_reload_lock = asyncio.Lock()
+catalog_reload_stats: Dict[str, Any] = {
+    "generation": None,
+    "version": None,
+    "build_seconds": None,
+    "reloaded_at": None,
+    "trigger": None,
+    "reloads": 0,
+    "failures": 0,
+    "last_error": None
+}
+shared_catalog_store: Optional[SharedCatalogStore] = SharedCatalogStore.from_env() if CATALOG_SHARED else None
 
 # Redis 클라이언트 설정 (선택사항)
-redis_client: Optional[redis.Redis] = None
+redis_client: Optional[RedisCache] = None
 redis_available: bool = False
 
 # 외부 서버 URL 설정
 LLM_SERVER_URL = os.getenv('LLM_SERVER_URL', 'http://localhost:8001')
 API_SERVER_URL = os.getenv('API_SERVER_URL', 'YOUR_API_URL')
 
-def initialize_redis():
-    """Redis 클라이언트 초기화"""
+# HTTP 커넥션 풀 설정 (업스트림별 장기 실행 클라이언트 공유)
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 30.0))
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+
+# 업스트림별 기본 타임아웃 (초)
+UPSTREAM_TIMEOUTS: Dict[str, float] = {
+    "llm": float(os.getenv('LLM_TIMEOUT', 30.0)),
+    "api": float(os.getenv('API_TIMEOUT', 15.0)),
+}
+
+http_clients: Dict[str, httpx.AsyncClient] = {}
+http_request_counts: Dict[str, int] = {}
+
+def _http2_supported() -> bool:
+    """HTTP/2 사용 가능 여부 (h2 패키지 필요)"""
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("⚠️ HTTP2_ENABLED=true 이지만 h2 패키지가 없음 (pip install httpx[http2]) - HTTP/1.1 사용")
+        return False
+
+def create_http_client(upstream: str) -> httpx.AsyncClient:
+    """업스트림용 커넥션 풀 httpx 클라이언트 생성"""
+    http2 = _http2_supported()
+    timeout = UPSTREAM_TIMEOUTS.get(upstream, 10.0)
+    client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        http2=http2
+    )
+    logger.info(f"🔌 HTTP 클라이언트 생성: {upstream} (timeout={timeout}s, http2={http2})")
+    return client
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """업스트림별 공유 httpx 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)"""
+    client = http_clients.get(upstream)
+    if client is None or client.is_closed:
+        client = create_http_client(upstream)
+        http_clients[upstream] = client
+    http_request_counts[upstream] = http_request_counts.get(upstream, 0) + 1
+    return client
+
+async def close_http_clients():
+    """모든 공유 httpx 클라이언트 종료"""
+    for upstream, client in list(http_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"⚠️ HTTP 클라이언트 종료 실패 ({upstream}): {e}")
+    http_clients.clear()
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """업스트림별 커넥션 풀 상태 (httpcore 내부 풀 정보는 가능한 경우에만 포함)"""
+    stats: Dict[str, Any] = {
+        "limits": {
+            "max_connections": HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": HTTP_KEEPALIVE_EXPIRY,
+            "http2_enabled": HTTP2_ENABLED
+        },
+        "upstreams": {}
+    }
+    for upstream in UPSTREAM_TIMEOUTS:
+        client = http_clients.get(upstream)
+        upstream_stats: Dict[str, Any] = {
+            "active": client is not None and not client.is_closed,
+            "timeout": UPSTREAM_TIMEOUTS[upstream],
+            "requests": http_request_counts.get(upstream, 0)
+        }
+        try:
+            connections = client._transport._pool.connections if client else []
+            upstream_stats["connections"] = len(connections)
+            upstream_stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+        except Exception:
+            pass
+        stats["upstreams"][upstream] = upstream_stats
+    return stats
+
+async def initialize_redis():
+    """Redis 캐시 클라이언트 초기화 (비동기 커넥션 풀)"""
     global redis_client, redis_available
     
     try:
         # Redis 설정 (Cloudtype 환경 변수 사용)
-        redis_host = os.getenv('REDIS_HOST', 'localhost')
-        redis_port = int(os.getenv('REDIS_PORT', 6379))
-        redis_password = os.getenv('REDIS_PASSWORD', 'YOUR_REDIS_PASSWORD')
-        redis_db = int(os.getenv('REDIS_DB', 0))
-        
-        logger.info(f"🔧 Redis 연결 시도: {redis_host}:{redis_port} (DB: {redis_db})")
-        
-        redis_client = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            password=redis_password,  # 비밀번호 지원 추가
-            db=redis_db,
-            decode_responses=True,
-            socket_connect_timeout=10,  # 타임아웃 증가
-            socket_timeout=10
-        )
+        redis_client = RedisCache.from_env()
+        logger.info(f"🔧 Redis 연결 시도: {redis_client.host}:{redis_client.port} (DB: {redis_client.db}, async: {redis_client.use_async})")
         
-        redis_available = redis_client.ping()
-        logger.info(f"✅ Redis 연결 성공: {redis_host}:{redis_port}")
+        redis_available = await redis_client.connect()
+        if not redis_available:
+            raise ConnectionError("Redis ping 실패")
+        logger.info(f"✅ Redis 연결 성공: {redis_client.host}:{redis_client.port}")
         
         # Redis 정보 로깅
         try:
-            info = redis_client.info()
+            info = await redis_client.info()
             logger.info(f"📊 Redis 정보: 버전 {info.get('redis_version', 'unknown')}, 메모리 {info.get('used_memory_human', 'unknown')}")
         except Exception as info_e:
             logger.warning(f"⚠️ Redis 정보 조회 실패: {info_e}")
             
     except Exception as e:
+        if redis_client is not None:
+            try:
+                await redis_client.close()
+            except Exception:
+                pass
         redis_client = None
         redis_available = False
         logger.warning(f"⚠️ Redis 연결 실패 (로컬 JSON 데이터로 대체): {e}")
         logger.info("💡 로컬 JSON 데이터를 주 데이터 소스로 사용합니다")
 
-def load_local_data() -> bool:
-    """cloudtype-proxy/data 폴더의 JSON 파일들을 메모리에 로드"""
-    global movie_data_cache, tv_data_cache, data_loaded
+def catalog_count(kind: str) -> int:
+    """현재 카탈로그의 영화("movie")/TV("tv") 레코드 수"""
+    catalog = local_catalog
+    return catalog.count(kind) if catalog is not None else 0
+
+def validate_catalog(candidate: Any, previous: Optional[Any] = None):
+    """
+    교체 전 새 카탈로그 검증 (실패 시 ValueError)
+    - 원본 파일이 있는데 레코드가 0개이거나, 기존 대비 CATALOG_RELOAD_MIN_RATIO 미만이면 거부
+    - 앞쪽 레코드 일부가 ID 인덱스로 다시 조회되는지 확인
+    """
+    for kind, path in (("movie", MOVIES_DATA_FILE), ("tv", TV_DATA_FILE)):
+        count = candidate.count(kind)
+        if Path(path).exists() and count == 0:
+            raise ValueError(f"{kind} 레코드가 비어 있음 ({path})")
+        if previous is not None and count < previous.count(kind) * CATALOG_RELOAD_MIN_RATIO:
+            raise ValueError(f"{kind} 레코드 수 급감 ({previous.count(kind)} → {count})")
+        for record in itertools.islice(candidate.records(kind), 50):
+            record_id = record.get("tmdb_id") or record.get("id")
+            if record_id is not None and candidate.get(kind, record_id) is None:
+                raise ValueError(f"{kind} 인덱스 누락 (ID {record_id})")
+
+def prepare_catalog(catalog: Any) -> Any:
+    """교체 전 카탈로그에 영화 컬럼형 쿼리 엔진 부착 (이미 있으면 그대로)"""
+    if catalog is not None and catalog.query_engine is None:
+        catalog.query_engine = CatalogQueryEngine(catalog.records("movie"))
+    return catalog
+
+def build_local_catalog(previous: Optional[Any], republish: bool) -> Any:
+    """
+    새 카탈로그 빌드 + 검증 (이벤트 루프 밖 스레드에서 실행, 전역 상태는 건드리지 않음)
+    컴파일된 스냅샷(data/catalog.snapshot)이 있으면 사용하고, 없으면 JSON 원본에서 빌드
+    공유 모드에서는 검증을 통과한 카탈로그만 새 세대로 발행
+    (republish=False면 기존 세대가 없거나 원본 JSON이 세대 발행 이후 바뀌었을 때만)
+    """
+    def build_validated() -> Dict[str, Any]:
+        data = load_catalog()
+        validate_catalog(Catalog(data), previous)
+        return data
     
-    if data_loaded:
-        return True
+    if shared_catalog_store is None:
+        return prepare_catalog(Catalog(build_validated(), generation=time.time_ns() // 1_000_000))
+    if republish:
+        shared_catalog_store.publish(build_validated())
+        return prepare_catalog(shared_catalog_store.current)
+    source_paths = {"movies": Path(MOVIES_DATA_FILE), "tv_shows": Path(TV_DATA_FILE)}
+    return prepare_catalog(shared_catalog_store.ensure_published(build_validated, source_paths))
+
+async def reload_local_catalog(trigger: str, republish: bool = True) -> bool:
+    """
+    로컬 카탈로그 (재)로드
+    빌드/검증은 스레드에서 수행하고, 성공하면 참조 한 번으로 교체 (진행 중인 요청은 이전 카탈로그를 계속 사용)
+    실패하면 기존 카탈로그를 유지
+    """
+    global local_catalog
     
-    try:
-        logger.info("📁 로컬 JSON 데이터 로딩 시작...")
-        
-        # 영화 데이터 로드
-        movie_json_path = Path("data/movie/tmdb_movies_hybrid_final.json")
-        if movie_json_path.exists():
-            logger.info(f"📄 영화 데이터 로딩: {movie_json_path}")
-            with open(movie_json_path, 'r', encoding='utf-8') as f:
-                movie_data_cache = json.load(f)
-            logger.info(f"✅ 영화 데이터 로드 완료: {len(movie_data_cache.get('movies', []))}개")
-        else:
-            logger.warning(f"⚠️ 영화 데이터 파일을 찾을 수 없음: {movie_json_path}")
-            movie_data_cache = {"movies": []}
-        
-        # TV 시리즈 데이터 로드  
-        tv_json_path = Path("data/tv series/tmdb_tv_series_final.json")
-        if tv_json_path.exists():
-            logger.info(f"📄 TV 시리즈 데이터 로딩: {tv_json_path}")
-            with open(tv_json_path, 'r', encoding='utf-8') as f:
-                tv_data_cache = json.load(f)
-            # 실제 파일 구조에 맞게 수정: 'tv_series' 키 사용
-            tv_count = len(tv_data_cache.get('tv_series', []))
-            logger.info(f"✅ TV 시리즈 데이터 로드 완료: {tv_count}개")
-            # 내부적으로는 'tv_shows' 키로 통일하여 사용
-            if 'tv_series' in tv_data_cache:
-                tv_data_cache['tv_shows'] = tv_data_cache['tv_series']
-        else:
-            logger.warning(f"⚠️ TV 시리즈 데이터 파일을 찾을 수 없음: {tv_json_path}")
-            tv_data_cache = {"tv_shows": []}
+    async with catalog_reload_lock:
+        logger.info(f"📁 로컬 카탈로그 빌드 시작 ({trigger})...")
+        started = time.perf_counter()
+        try:
+            catalog = await asyncio.to_thread(build_local_catalog, local_catalog, republish)
+        except Exception as e:
+            catalog_reload_stats["failures"] += 1
+            catalog_reload_stats["last_error"] = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ 로컬 카탈로그 빌드 실패 ({trigger}, 기존 카탈로그 유지): {e}")
+            return False
+        build_seconds = round(time.perf_counter() - started, 4)
         
-        data_loaded = True
-        logger.info("🎉 모든 로컬 데이터 로딩 완료!")
-        return True
+        local_catalog = catalog
+        ott_l1_cache.clear()
         
-    except Exception as e:
-        logger.error(f"❌ 로컬 데이터 로딩 실패: {e}")
-        movie_data_cache = {"movies": []}
-        tv_data_cache = {"tv_shows": []}
-        return False
+        catalog_reload_stats.update(
+            generation=catalog.generation,
+            version=catalog.version,
+            build_seconds=build_seconds,
+            reloaded_at=datetime.now().isoformat(),
+            trigger=trigger,
+            reloads=catalog_reload_stats["reloads"] + 1,
+            last_error=None
+        )
+        load_stats = catalog.load_stats
+        logger.info(
+            f"✅ 카탈로그 교체 완료: 세대 {catalog.generation}, 영화 {catalog.count('movie')}개, "
+            f"TV {catalog.count('tv')}개, 빌드 {build_seconds}초 "
+            f"({catalog.backend}, {load_stats.get('source')}, RSS {load_stats.get('rss_before_mb')}MB → "
+            f"{load_stats.get('rss_after_mb')}MB)"
+        )
+        return True
+
+def _catalog_source_mtimes() -> tuple:
+    mtimes = []
+    for path in (MOVIES_DATA_FILE, TV_DATA_FILE):
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+async def watch_catalog_files():
+    """원본 JSON mtime 변경 시 백그라운드 재로드 (CATALOG_WATCH_INTERVAL > 0일 때만 실행)"""
+    last_mtimes = _catalog_source_mtimes()
+    while True:
+        await asyncio.sleep(CATALOG_WATCH_INTERVAL)
+        try:
+            mtimes = _catalog_source_mtimes()
+            present = [m for m in mtimes if m is not None]
+            # 원본 파일이 모두 없으면 (데이터 디렉터리 일시 부재 등) 다시 나타날 때까지 대기
+            if mtimes == last_mtimes or not present:
+                continue
+            last_mtimes = mtimes
+            
+            # 공유 모드: 다른 워커가 이미 변경 이후 세대를 발행했으면 그 세대를 따름
+            if shared_catalog_store is not None:
+                current = shared_catalog_store.refresh()
+                if current is not None and current.built_at >= max(present):
+                    continue
+            logger.info("👀 카탈로그 원본 파일 변경 감지")
+            await reload_local_catalog("watch")
+        except Exception:
+            # 감시 태스크가 죽으면 워커가 끝날 때까지 재로드가 멈추므로 기록만 하고 계속
+            logger.exception("❌ 카탈로그 파일 감시 중 오류 (다음 주기에 재시도)")
+
+async def watch_shared_catalog():
+    """공유 모드: 다른 워커가 발행한 새 세대를 주기적으로 확인해 참조를 교체"""
+    global local_catalog
+    while True:
+        await asyncio.sleep(CATALOG_GENERATION_CHECK_INTERVAL)
+        try:
+            mapped = shared_catalog_store.refresh()
+            if mapped is not None and mapped is not local_catalog:
+                await asyncio.to_thread(prepare_catalog, mapped)
+                local_catalog = mapped
+                ott_l1_cache.clear()
+                catalog_reload_stats.update(
+                    generation=mapped.generation,
+                    version=mapped.version,
+                    reloaded_at=datetime.now().isoformat(),
+                    trigger="shared"
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ 공유 카탈로그 세대 확인 실패: {e}")
 
-def get_ott_links_from_local_data(movie_id: int) -> List[Dict[str, Any]]:
-    """로컬 JSON 데이터에서 특정 영화의 OTT 링크 조회"""
+def get_ott_links_from_local_data(movie_id: int, media_type: str = "movie") -> Sequence[Dict[str, Any]]:
+    """
+    로컬 카탈로그에서 특정 영화/TV 시리즈의 OTT 링크 조회
+    media_type="movie"는 영화 인덱스를 먼저 보고 TV 인덱스로 대체, "tv"는 TV 인덱스만 조회
+    로딩 시 정규화된 페이로드를 그대로 반환 (호출 측에서 수정하지 말 것)
+    """
     try:
-        logger.info(f"🔍 로컬 데이터에서 영화 ID {movie_id} OTT 링크 검색...")
-        
-        if not data_loaded:
-            load_local_data()
-        
-        # 영화 데이터에서 검색
-        if movie_data_cache and "movies" in movie_data_cache:
-            for movie in movie_data_cache["movies"]:
-                if movie.get("tmdb_id") == movie_id or movie.get("id") == movie_id:
-                    raw_ott_links = movie.get("ott_links", [])
-                    logger.info(f"🔍 원본 OTT 링크 데이터 형식: {type(raw_ott_links)}")
-                    
-                    # 데이터 형식 변환: 문자열 -> 딕셔너리
-                    formatted_ott_links = []
-                    for i, link in enumerate(raw_ott_links):
-                        if isinstance(link, str):
-                            # 문자열인 경우 딕셔너리로 변환
-                            formatted_link = {
-                                "provider_name": "Unknown",
-                                "provider_id": i + 1,
-                                "logo_path": "",
-                                "display_priority": i + 1,
-                                "link": link
-                            }
-                            formatted_ott_links.append(formatted_link)
-                        elif isinstance(link, dict):
-                            # 이미 딕셔너리인 경우 그대로 사용
-                            formatted_ott_links.append(link)
-                        else:
-                            logger.warning(f"⚠️ 알 수 없는 OTT 링크 형식: {type(link)}")
-                    
-                    logger.info(f"✅ 영화 ID {movie_id} OTT 링크 발견: {len(formatted_ott_links)}개")
-                    return formatted_ott_links
-        
-        # TV 데이터에서도 검색 (혹시 모를 경우를 대비)
-        if tv_data_cache and "tv_shows" in tv_data_cache:
-            for tv_show in tv_data_cache["tv_shows"]:
-                if tv_show.get("tmdb_id") == movie_id or tv_show.get("id") == movie_id:
-                    raw_ott_links = tv_show.get("ott_links", [])
-                    # 동일한 형식 변환 적용
-                    formatted_ott_links = []
-                    for i, link in enumerate(raw_ott_links):
-                        if isinstance(link, str):
-                            formatted_link = {
-                                "provider_name": "Unknown",
-                                "provider_id": i + 1,
-                                "logo_path": "",
-                                "display_priority": i + 1,
-                                "link": link
-                            }
-                            formatted_ott_links.append(formatted_link)
-                        elif isinstance(link, dict):
-                            formatted_ott_links.append(link)
-                    logger.info(f"✅ TV ID {movie_id} OTT 링크 발견: {len(formatted_ott_links)}개")
-                    return formatted_ott_links
-        
-        # 원본 tv_series 키에서도 검색 (백업)
-        if tv_data_cache and "tv_series" in tv_data_cache:
-            for tv_show in tv_data_cache["tv_series"]:
-                if tv_show.get("tmdb_id") == movie_id or tv_show.get("id") == movie_id:
-                    raw_ott_links = tv_show.get("ott_links", [])
-                    # 동일한 형식 변환 적용
-                    formatted_ott_links = []
-                    for i, link in enumerate(raw_ott_links):
-                        if isinstance(link, str):
-                            formatted_link = {
-                                "provider_name": "Unknown",
-                                "provider_id": i + 1,
-                                "logo_path": "",
-                                "display_priority": i + 1,
-                                "link": link
-                            }
-                            formatted_ott_links.append(formatted_link)
-                        elif isinstance(link, dict):
-                            formatted_ott_links.append(link)
-                    logger.info(f"✅ TV ID {movie_id} OTT 링크 발견 (원본): {len(formatted_ott_links)}개")
-                    return formatted_ott_links
-        
-        logger.warning(f"⚠️ 영화 ID {movie_id}에 대한 OTT 링크를 찾을 수 없음")
-        return []
+        catalog = local_catalog
+        if catalog is None:
+            return ()
+        
+        if media_type == "tv":
+            record = catalog.get("tv", movie_id)
+        else:
+            # 영화 인덱스 우선, TV 인덱스에서도 검색 (혹시 모를 경우를 대비)
+            record = catalog.get("movie", movie_id) or catalog.get("tv", movie_id)
+        
+        if record is not None:
+            return record.get("ott_payload", ())
+        
+        logger.debug(f"⚠️ {media_type} ID {movie_id}에 대한 OTT 링크를 찾을 수 없음")
+        return ()
         
     except Exception as e:
-        logger.error(f"❌ 로컬 데이터에서 OTT 링크 조회 실패 (movie_id: {movie_id}): {e}")
-        return []
+        logger.error(f"❌ 로컬 데이터에서 OTT 링크 조회 실패 ({media_type}_id: {movie_id}): {e}")
+        return ()
+
+# OTT 링크 Redis 캐시 만료 시간 (기본 24시간)
+OTT_CACHE_TTL = int(os.getenv('OTT_CACHE_TTL', 24 * 60 * 60))
+
+# OTT 링크가 없는 작품의 네거티브 캐시 (Redis에는 마커 문자열로 저장, 기본 1시간)
+OTT_NEGATIVE_CACHE_TTL = int(os.getenv('OTT_NEGATIVE_CACHE_TTL', 60 * 60))
+OTT_NEGATIVE_MARKER = "__no_ott__"
+ott_negative_stats: Dict[str, int] = {"l1_hits": 0, "redis_hits": 0, "stored": 0}
+
+# OTT 링크 L1 캐시 (프로세스 내 LRU/TTL, Redis L2 · 로컬 JSON L3 앞단)
+ott_l1_cache = TTLCache(
+    max_size=int(os.getenv('OTT_L1_MAX_SIZE', 5000)),
+    ttl=float(os.getenv('OTT_L1_TTL', 300))
+)
+
+def ott_cache_key(movie_id: int, media_type: str = "movie") -> str:
+    """
+    OTT 링크 Redis 키 (카탈로그 내용 버전 포함)
+    재로드로 원본이 바뀌면 키가 달라져 이전 카탈로그의 링크/네거티브 마커를 더 이상 읽지 않음 (이전 키는 TTL로 만료)
+    """
+    catalog = local_catalog
+    version = catalog.version if catalog is not None else "none"
+    return f"{media_type}:{movie_id}:ott_links:{version}"
 
-def get_ott_links_from_redis(movie_id: int) -> List[Dict[str, Any]]:
-    """Redis에서 OTT 링크 조회"""
+async def get_ott_links_from_redis_many(movie_ids: List[int], media_type: str = "movie") -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Redis에서 여러 영화의 OTT 링크를 MGET 한 번으로 조회 (발견된 ID만 반환)
+    네거티브 캐시 항목은 빈 리스트로 반환
+    """
     try:
-        if not redis_available or redis_client is None:
-            return []
-            
-        logger.info(f"🔍 Redis에서 영화 ID {movie_id} OTT 링크 검색...")
-        key = f"movie:{movie_id}:ott_links"
-        ott_data = redis_client.get(key)
-        
-        if ott_data:
-            ott_links = json.loads(ott_data)
-            logger.info(f"✅ Redis에서 영화 ID {movie_id} OTT 링크 발견: {len(ott_links)}개")
-            return ott_links
-        else:
-            logger.info(f"ℹ️ Redis에 영화 ID {movie_id} 데이터 없음")
-            return []
-            
+        if not redis_available or redis_client is None or not movie_ids:
+            return {}
+        
+        values = await redis_client.mget([ott_cache_key(movie_id, media_type) for movie_id in movie_ids])
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        for movie_id, ott_data in zip(movie_ids, values):
+            if not ott_data:
+                continue
+            if ott_data == OTT_NEGATIVE_MARKER:
+                ott_negative_stats["redis_hits"] += 1
+                results[movie_id] = []
+            else:
+                results[movie_id] = fast_json.loads(ott_data)
+        return results
+        
     except Exception as e:
-        logger.error(f"❌ Redis에서 OTT 링크 조회 실패 (movie_id: {movie_id}): {e}")
-        return []
+        logger.error(f"❌ Redis에서 OTT 링크 일괄 조회 실패 ({len(movie_ids)}개): {e}")
+        return {}
 
-def cache_ott_links_to_redis(movie_id: int, ott_links: List[Dict[str, Any]]) -> bool:
-    """OTT 링크를 Redis에 캐싱"""
+async def cache_ott_links_to_redis_many(ott_links_by_id: Dict[int, Sequence[Dict[str, Any]]], media_type: str = "movie") -> bool:
+    """
+    여러 영화의 OTT 링크를 하나의 파이프라인으로 Redis에 캐싱
+    빈 링크 목록은 네거티브 마커로 더 짧은 TTL과 함께 저장
+    """
     try:
-        if not redis_available or redis_client is None:
-            logger.warning("⚠️ Redis 사용 불가 - 캐싱 건너뛰기")
+        if not redis_available or redis_client is None or not ott_links_by_id:
             return False
-            
-        key = f"movie:{movie_id}:ott_links"
-        # OTT 링크 JSON으로 직렬화
-        ott_data = json.dumps(ott_links, ensure_ascii=False)
-        
-        # 캐시 만료 시간 설정 (24시간)
-        cache_ttl = 24 * 60 * 60  # 24시간
         
-        # Redis에 저장
-        redis_client.setex(key, cache_ttl, ott_data)
+        entries = [
+            (ott_cache_key(movie_id, media_type), OTT_CACHE_TTL, fast_json.dumps_str(ott_links))
+            if ott_links else
+            (ott_cache_key(movie_id, media_type), OTT_NEGATIVE_CACHE_TTL, OTT_NEGATIVE_MARKER)
+            for movie_id, ott_links in ott_links_by_id.items()
+        ]
+        await redis_client.setex_many(entries)
         
-        logger.info(f"✅ Redis에 영화 ID {movie_id} OTT 링크 캐싱 완료 (TTL: {cache_ttl}초)")
+        logger.debug(f"📦 Redis에 OTT 링크 {len(entries)}개 캐싱 완료 (TTL: {OTT_CACHE_TTL}초, 네거티브 TTL: {OTT_NEGATIVE_CACHE_TTL}초)")
         return True
         
     except Exception as e:
-        logger.error(f"❌ Redis에 OTT 링크 캐싱 실패 (movie_id: {movie_id}): {e}")
+        logger.error(f"❌ Redis에 OTT 링크 일괄 캐싱 실패 ({len(ott_links_by_id)}개): {e}")
         return False
 
-def get_ott_links_with_caching(movie_id: int) -> List[Dict[str, Any]]:
-    """캐싱을 활용한 OTT 링크 조회 (Redis 우선, 로컬 데이터 백업)"""
+async def get_ott_links_many(movie_ids: List[int], media_type: str = "movie") -> Dict[int, Sequence[Dict[str, Any]]]:
+    """
+    여러 영화의 OTT 링크 일괄 조회 (L1 메모리 → Redis MGET → 로컬 인덱스 → Redis 파이프라인 백필)
+    페이지 단위 enrichment에서 영화 수와 관계없이 Redis 왕복을 최대 2회로 제한
+    OTT 링크가 없는 작품도 네거티브 캐시로 저장해 반복 조회 시 로컬 검색을 건너뜀
+    """
+    unique_ids = list(dict.fromkeys(movie_id for movie_id in movie_ids if movie_id))
+    if not unique_ids:
+        return {}
+    
     try:
-        logger.info(f"🔍 영화 ID {movie_id} OTT 링크 조회 시작 (캐싱 활용)")
+        # 1. L1 메모리 캐시 확인 (빈 튜플은 네거티브 캐시 히트)
+        results: Dict[int, Sequence[Dict[str, Any]]] = {}
+        l1_misses: List[int] = []
+        for movie_id in unique_ids:
+            ott_links = ott_l1_cache.get(ott_cache_key(movie_id, media_type))
+            if ott_links is None:
+                l1_misses.append(movie_id)
+            else:
+                if not ott_links:
+                    ott_negative_stats["l1_hits"] += 1
+                results[movie_id] = ott_links
         
-        # 1. Redis에서 먼저 확인
-        ott_links = get_ott_links_from_redis(movie_id)
+        if not l1_misses:
+            return results
         
-        if ott_links:
-            logger.info(f"✅ Redis 캐시에서 OTT 링크 발견: {len(ott_links)}개")
-            return ott_links
+        # 2. Redis에서 한 번에 조회 (L2)
+        redis_hits = await get_ott_links_from_redis_many(l1_misses, media_type)
+        for movie_id, ott_links in redis_hits.items():
+            ott_links = tuple(ott_links)
+            results[movie_id] = ott_links
+            ott_l1_cache.set(
+                ott_cache_key(movie_id, media_type),
+                ott_links,
+                ttl=None if ott_links else min(ott_l1_cache.ttl, OTT_NEGATIVE_CACHE_TTL)
+            )
         
-        # 2. Redis에 없으면 로컬 데이터에서 검색
-        logger.info(f"📁 로컬 데이터에서 영화 ID {movie_id} 검색...")
-        ott_links = get_ott_links_from_local_data(movie_id)
+        # 3. Redis에 없는 ID는 로컬 인덱스에서 한 번에 해결 (L3)
+        resolved_locally: Dict[int, Sequence[Dict[str, Any]]] = {}
+        for movie_id in l1_misses:
+            if movie_id not in results:
+                ott_links = get_ott_links_from_local_data(movie_id, media_type)
+                results[movie_id] = ott_links
+                resolved_locally[movie_id] = ott_links
+                if ott_links:
+                    ott_l1_cache.set(ott_cache_key(movie_id, media_type), ott_links)
+                else:
+                    ott_l1_cache.set(ott_cache_key(movie_id, media_type), (), ttl=min(ott_l1_cache.ttl, OTT_NEGATIVE_CACHE_TTL))
+                    ott_negative_stats["stored"] += 1
         
-        if ott_links:
-            logger.info(f"✅ 로컬 데이터에서 OTT 링크 발견: {len(ott_links)}개")
-            
-            # 3. 로컬 데이터에서 찾은 결과를 Redis에 캐싱
-            cache_success = cache_ott_links_to_redis(movie_id, ott_links)
-            if cache_success:
-                logger.info(f"📦 Redis 캐싱 완료 - 다음 요청부터 더 빠르게 응답")
-            
-            return ott_links
+        # 4. 로컬 조회 결과(네거티브 포함)를 파이프라인 하나로 Redis에 백필
+        if resolved_locally:
+            await cache_ott_links_to_redis_many(resolved_locally, media_type)
         
-        logger.warning(f"⚠️ 영화 ID {movie_id}에 대한 OTT 링크를 찾을 수 없음")
-        return []
+        logger.debug(f"🔗 OTT 링크 일괄 조회: {len(unique_ids)}개 요청, L1 미스 {len(l1_misses)}개, Redis 히트 {len(redis_hits)}개, 로컬 조회 {len(resolved_locally)}개")
+        return results
         
     except Exception as e:
-        logger.error(f"❌ OTT 링크 조회 실패 (movie_id: {movie_id}): {e}")
-        return []
+        logger.error(f"❌ OTT 링크 일괄 조회 실패 ({len(unique_ids)}개): {e}")
+        return {movie_id: () for movie_id in unique_ids}
+
+async def get_ott_links_with_caching(movie_id: int, media_type: str = "movie") -> Sequence[Dict[str, Any]]:
+    """캐싱을 활용한 단일 OTT 링크 조회 (Redis 우선, 로컬 데이터 백업)"""
+    results = await get_ott_links_many([movie_id], media_type)
+    return results.get(movie_id, ())
+
+# === 업스트림 헬스 프로버 (백그라운드 주기 확인, /health는 캐시된 상태로 응답) ===
+HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', 15))
+HEALTH_PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', 5))
+HEALTH_STATUS_LABELS = {"up": "connected", "down": "disconnected", "unknown": "unknown"}
+
+async def probe_upstream_health(upstream: str, base_url: str) -> bool:
+    response = await get_http_client(upstream).get(f"{base_url}/health", timeout=HEALTH_PROBE_TIMEOUT)
+    return response.status_code == 200
+
+upstream_probers: Dict[str, HealthProber] = {
+    "llm": HealthProber(
+        "llm_server", lambda: probe_upstream_health("llm", LLM_SERVER_URL),
+        interval=HEALTH_PROBE_INTERVAL, timeout=HEALTH_PROBE_TIMEOUT
+    ),
+    "api": HealthProber(
+        "api_server", lambda: probe_upstream_health("api", API_SERVER_URL),
+        interval=HEALTH_PROBE_INTERVAL, timeout=HEALTH_PROBE_TIMEOUT
+    ),
+}
 
 # === 앱 라이프사이클 관리 (Python 3.12 최신 방식) ===
 @asynccontextmanager
@@ -299,12 +522,27 @@ async def lifespan(app: FastAPI):
     logger.info(f"📂 데이터 폴더 존재 여부: {Path('data').exists()}")
     
     # Redis 초기화
-    initialize_redis()
+    await initialize_redis()
+    
+    # 업스트림별 공유 HTTP 클라이언트 생성
+    for upstream in UPSTREAM_TIMEOUTS:
+        http_clients[upstream] = create_http_client(upstream)
+    
+    # 업스트림 헬스 프로버 시작
+    for prober in upstream_probers.values():
+        prober.start()
     
     # 로컬 데이터 로드
-    load_success = load_local_data()
+    load_success = await reload_local_catalog("startup", republish=False)
     logger.info(f"📊 데이터 로딩 결과: {'성공' if load_success else '실패'}")
     
+    # 공유 카탈로그 세대 감시 (멀티 워커) / 원본 파일 변경 감시
+    catalog_tasks = []
+    if shared_catalog_store:
+        catalog_tasks.append(asyncio.create_task(watch_shared_catalog()))
+    if CATALOG_WATCH_INTERVAL > 0:
+        catalog_tasks.append(asyncio.create_task(watch_catalog_files()))
+    
     # 환경 정보 로깅
     logger.info(f"🌍 환경 변수:")
     logger.info(f"  - LLM_SERVER_URL: {LLM_SERVER_URL}")
@@ -316,9 +554,16 @@ async def lifespan(app: FastAPI):
     
     # 종료 시 실행
     logger.info("🔄 OpusCine Proxy Server 종료 중...")
+    for task in catalog_tasks:
+        task.cancel()
+    for task in list(recommend_revalidations.values()):
+        task.cancel()
+    for prober in upstream_probers.values():
+        await prober.stop()
+    await close_http_clients()
     if redis_client:
         try:
-            redis_client.close()
+            await redis_client.close()
             logger.info("✅ Redis 연결 정리 완료")
         except Exception as e:
             logger.warning(f"⚠️ Redis 연결 정리 실패: {e}")
@@ -328,8 +573,10 @@ app = FastAPI(
     title="OpusCine Proxy Server", 
     version="1.0.0",
     description="Spring 프론트엔드와 LLM/API 서버 간의 프록시 서버",
-    lifespan=lifespan  # 새로운 라이프사이클 방식
+    lifespan=lifespan,  # 새로운 라이프사이클 방식
+    default_response_class=FastJSONResponse  # orjson 직렬화 + 직렬화 시간 측정
 )
+app.router.route_class = TimedRoute  # 직렬화 시간에 FastAPI 응답 검증/변환 단계 포함
 
 # CORS 설정 (Spring 프론트엔드 연동)
 app.add_middleware(
@@ -340,6 +587,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 경로를 로깅 컨텍스트에 기록 (경로별 로그 샘플링용)
+app.add_middleware(RouteContextMiddleware)
+
 logger.info(f"🔗 LLM 서버 URL: {LLM_SERVER_URL}")
 logger.info(f"🔗 API 서버 URL: {API_SERVER_URL}")
 
@@ -364,6 +614,8 @@ class MovieInfo(BaseModel):
     genre_ids: List[int] = Field(default_factory=list, description="장르 ID 목록")
     ott_links: List[Dict[str, Any]] = Field(default_factory=list, description="OTT 링크 목록")
 
+movie_list_adapter = TypeAdapter(List[MovieInfo])
+
 class RecommendResponse(BaseModel):
     success: bool = Field(..., description="요청 성공 여부")
     data: Optional[Dict[str, Any]] = Field(None, description="추가 데이터")
@@ -378,155 +630,435 @@ class OTTLinksResponse(BaseModel):
     ott_links: List[Dict[str, Any]] = Field(default_factory=list, description="OTT 링크 목록")
     error: Optional[str] = Field(None, description="에러 메시지")
 
+class OTTBatchRequest(BaseModel):
+    movie_ids: List[int] = Field(default_factory=list, description="영화 ID 목록")
+    tv_ids: List[int] = Field(default_factory=list, description="TV 시리즈 ID 목록")
+
+class OTTBatchResponse(BaseModel):
+    success: bool = Field(..., description="요청 성공 여부")
+    movies: Dict[int, List[Dict[str, Any]]] = Field(default_factory=dict, description="영화 ID별 OTT 링크 목록")
+    tv: Dict[int, List[Dict[str, Any]]] = Field(default_factory=dict, description="TV 시리즈 ID별 OTT 링크 목록")
+    missing: Dict[str, List[int]] = Field(default_factory=dict, description="OTT 링크가 없는 ID (movie/tv)")
+    error: Optional[str] = Field(None, description="에러 메시지")
+
 # === Spring 연동 전용 엔드포인트 ===
 @app.get("/")
 async def root() -> Dict[str, Any]:
     """헬스 체크 엔드포인트"""
-    logger.info("🏠 루트 엔드포인트 호출됨")
+    logger.debug("🏠 루트 엔드포인트 호출됨")
     return {
         "service": "OpusCine Proxy Server",
         "status": "running",
         "version": "1.0.1",  # 버전 업데이트로 새 코드 확인
         "python_version": "3.12.9",
         "spring_ready": True,
-        "data_loaded": data_loaded,
+        "data_loaded": local_catalog is not None,
         "redis_available": redis_available,
         "debug_info": "2025-06-25 코드 업데이트됨",  # 새 필드 추가
         "total_routes": len(app.routes),  # 등록된 라우트 수 표시
         "timestamp": datetime.now().isoformat()
     }
 
+# === 추천 결과 캐시 (Redis 공유, 정규화된 메시지 + page + limit 기준) ===
+RECOMMEND_CACHE_TTL = int(os.getenv('RECOMMEND_CACHE_TTL', 600))
+# TTL이 지난 추천 결과를 LLM 장애 시 대신 응답하기 위해 더 보관하는 시간 (stale-if-error)
+RECOMMEND_STALE_WINDOW = int(os.getenv('RECOMMEND_STALE_WINDOW', 6 * 60 * 60))
+
+# 동일한 추천 요청의 동시 실행 병합 (GPU LLM 서버 중복 호출 방지)
+recommend_single_flight = SingleFlight()
+
+def normalize_recommend_message(message: str) -> str:
+    """캐시 키용 메시지 정규화 (유니코드 NFKC, 대소문자, 문장부호/기호, 공백 통일)"""
+    normalized = unicodedata.normalize("NFKC", message).casefold()
+    normalized = "".join(
+        " " if unicodedata.category(ch)[0] in ("P", "S") else ch
+        for ch in normalized
+    )
+    return " ".join(normalized.split())
+
+def recommend_cache_key(request: RecommendRequest) -> str:
+    """추천 결과 Redis 키 (정규화된 메시지 해시 + page + limit)"""
+    message_hash = hashlib.sha1(normalize_recommend_message(request.message).encode("utf-8")).hexdigest()
+    return f"recommend:{message_hash}:{request.page}:{request.limit}"
+
+async def get_cached_recommendation(cache_key: str, allow_stale: bool = False) -> Optional[RecommendResponse]:
+    """
+    Redis에서 캐시된 추천 결과 조회 (cache_hit/cache_age/stale 메타데이터 포함)
+    RECOMMEND_CACHE_TTL이 지난 항목은 allow_stale=True(LLM 장애 시)일 때만 반환
+    """
+    try:
+        if not redis_available or redis_client is None or RECOMMEND_CACHE_TTL <= 0:
+            return None
+        
+        cached_data = await redis_client.get(cache_key)
+        if not cached_data:
+            return None
+        
+        # 저장 전에 검증된 결과이므로 재검증 없이 모델 구성
+        cached = fast_json.loads(cached_data)
+        age = time.time() - cached["cached_at"]
+        stale = age >= RECOMMEND_CACHE_TTL
+        if stale and not allow_stale:
+            return None
+        payload = cached["response"]
+        response = RecommendResponse.model_construct(**{
+            **payload,
+            "movies": [MovieInfo.model_construct(**movie) for movie in payload["movies"]] if payload.get("movies") is not None else None
+        })
+        response.query_info = {
+            **(response.query_info or {}),
+            "cache_hit": True,
+            "cache_age_seconds": round(age, 3),
+            "stale": stale
+        }
+        return response
+        
+    except Exception as e:
+        logger.error(f"❌ 추천 결과 캐시 조회 실패 ({cache_key}): {e}")
+        return None
+
+async def cache_recommendation(cache_key: str, response: RecommendResponse) -> bool:
+    """성공한 추천 결과를 Redis에 캐싱 (TTL + 장애 대비 보관 시간)"""
+    try:
+        if not redis_available or redis_client is None or RECOMMEND_CACHE_TTL <= 0:
+            return False
+        
+        cached_data = fast_json.dumps_str({"cached_at": time.time(), "response": response.model_dump(mode="json")})
+        await redis_client.setex(cache_key, RECOMMEND_CACHE_TTL + RECOMMEND_STALE_WINDOW, cached_data)
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ 추천 결과 캐싱 실패 ({cache_key}): {e}")
+        return False
+
 @app.post("/api/movies/recommend", response_model=RecommendResponse)
-async def recommend_movies_for_spring(request: RecommendRequest) -> RecommendResponse:
+async def recommend_movies_for_spring(request: RecommendRequest) -> FastJSONResponse:
     """
     Spring 프론트엔드를 위한 영화 추천 API
     경로: /api/movies/recommend
+    동일한 (정규화된) 요청은 RECOMMEND_CACHE_TTL 동안 Redis 캐시에서 응답
+    응답 모델은 이미 검증된 상태이므로 FastAPI 재검증 없이 바로 직렬화
     """
-    start_time = datetime.now()
-    logger.info(f"🎬 영화 추천 요청 시작 - 사용자: {request.user_id}, 메시지: '{request.message}'")
-    logger.info(f"📄 요청 파라미터: page={request.page}, limit={request.limit}")
+    cache_key = recommend_cache_key(request)
+    cached = await get_cached_recommendation(cache_key)
+    if cached is not None:
+        cached.query_info["original_message"] = request.message
+        logger.debug(f"⚡ 추천 결과 캐시 히트: '{request.message}' (age: {cached.query_info['cache_age_seconds']}초)")
+        return FastJSONResponse(cached)
+    
+    # 동일 키로 진행 중인 LLM 요청이 있으면 그 결과를 공유 (single-flight)
+    result, coalesced = await recommend_single_flight.do(
+        cache_key,
+        lambda: fetch_and_cache_recommendation(request, cache_key)
+    )
+    if coalesced:
+        result = result.model_copy(deep=True)
+        if result.query_info is not None:
+            result.query_info["original_message"] = request.message
+        logger.debug(f"🔀 진행 중인 동일 추천 요청에 병합: '{request.message}'")
+    if result.query_info is not None:
+        result.query_info["coalesced"] = coalesced
+    return FastJSONResponse(result)
+
+# === LLM 서킷 브레이커 + 로컬 카탈로그 대체 추천 ===
+llm_circuit = CircuitBreaker(
+    "llm_server",
+    failure_threshold=int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', 3)),
+    slow_call_seconds=float(os.getenv('LLM_CIRCUIT_SLOW_CALL_SECONDS', 15)),
+    reset_timeout=float(os.getenv('LLM_CIRCUIT_RESET_TIMEOUT', 30)),
+    half_open_timeout=float(os.getenv('LLM_CIRCUIT_HALF_OPEN_TIMEOUT', 60))
+)
+LLM_FALLBACK_ENABLED = os.getenv('LLM_FALLBACK_ENABLED', 'true').lower() == 'true'
+
+def build_fallback_recommendation(request: RecommendRequest, reason: str, llm_error: Optional[str] = None) -> RecommendResponse:
+    """
+    LLM 없이 로컬 영화 카탈로그에서 키워드 기반 추천 (query_info.degraded=True)
+    reason: "circuit_open"(호출 생략) 또는 "llm_error"(호출 실패 후 대체)
+    """
+    started = time.perf_counter()
+    catalog = local_catalog
+    if catalog is None:
+        return RecommendResponse(success=False, error=llm_error or "추천 서버에 연결할 수 없고 로컬 데이터도 없습니다.")
     
+    params, movies, total = recommend_from_catalog(catalog, request.message, request.page, request.limit)
+    processing_time = time.perf_counter() - started
+    logger.info(f"🛟 로컬 대체 추천 ({reason}): {len(movies)}/{total}개, 파라미터 {params} ({processing_time * 1000:.1f}ms)")
+    
+    return RecommendResponse(
+        success=True,
+        movies=[MovieInfo.model_construct(**movie) for movie in movies],  # 로컬 카탈로그 페이로드는 검증 불필요
+        total_results=total,
+        query_info={
+            "original_message": request.message,
+            "tmdb_parameters": params,
+            "confidence": 0.5,
+            "method": "local_keyword_fallback",
+            "reasoning": "LLM 서버를 사용할 수 없어 메시지 키워드로 로컬 카탈로그를 필터링했습니다.",
+            "processing_time_ms": 0,
+            "proxy_processing_time_seconds": processing_time,
+            "pagination": {
+                "page": request.page,
+                "total_pages": (total + request.limit - 1) // request.limit,
+                "total_results": total
+            },
+            "conversation": {},
+            "recommendation_explanation": "지금은 AI 추천을 사용할 수 없어 키워드 기반 추천 결과를 보여드려요.",
+            "degraded": True,
+            "degraded_reason": reason,
+            "llm_error": llm_error,
+            "circuit_state": llm_circuit.state,
+            "cache_hit": False,
+            "cache_age_seconds": 0
+        }
+    )
+
+# === 오래된 추천 캐시 응답 (stale-if-error) + 백그라운드 재검증 ===
+RECOMMEND_REVALIDATE_DELAY = float(os.getenv('RECOMMEND_REVALIDATE_DELAY', 10))
+recommend_revalidations: Dict[str, asyncio.Task] = {}
+recommend_stale_stats: Dict[str, int] = {"served": 0, "revalidations": 0, "refreshed": 0, "failed": 0}
+
+async def revalidate_recommendation(request: RecommendRequest, cache_key: str):
+    """
+    잠시 후 LLM을 다시 호출해 캐시 갱신
+    포그라운드 요청과 같은 키의 single-flight로 실행해 LLM 중복 호출을 막고,
+    LLM 결과가 아닌 응답(오래된 캐시/대체 추천)이나 예외는 실패로 집계
+    """
     try:
-        # 1. LLM 서버에 완전한 영화 추천 요청 (영화 데이터 포함)
-        logger.info(f"🤖 LLM 서버에 영화 추천 요청 전송: {LLM_SERVER_URL}/movie-recommend")
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # LLM 서버의 movie-recommend 엔드포인트 요청 형식
-            llm_request_data = {
-                "message": request.message,
-                "user_id": request.user_id or "anonymous",
-                "context": {
-                    "page": request.page,
-                    "limit": request.limit
-                }
-            }
-            
-            llm_response = await client.post(
-                f"{LLM_SERVER_URL}/movie-recommend",
-                json=llm_request_data
+        await asyncio.sleep(RECOMMEND_REVALIDATE_DELAY)
+        result, coalesced = await recommend_single_flight.do(
+            cache_key,
+            lambda: fetch_and_cache_recommendation(request, cache_key)
+        )
+        query_info = result.query_info or {}
+        if result.success and not query_info.get("stale") and not query_info.get("degraded"):
+            recommend_stale_stats["refreshed"] += 1
+            logger.info(f"✅ 추천 캐시 재검증 완료: '{request.message}' (병합: {coalesced})")
+        else:
+            recommend_stale_stats["failed"] += 1
+            logger.warning(f"⚠️ 추천 캐시 재검증 실패: '{request.message}' ({result.error or query_info.get('stale_reason') or query_info.get('degraded_reason')})")
+    except Exception as e:
+        recommend_stale_stats["failed"] += 1
+        logger.warning(f"⚠️ 추천 캐시 재검증 중 예외: '{request.message}' ({type(e).__name__}: {e})")
+    finally:
+        recommend_revalidations.pop(cache_key, None)
+
+async def serve_stale_recommendation(request: RecommendRequest, cache_key: str, reason: str, llm_error: Optional[str] = None) -> Optional[RecommendResponse]:
+    """
+    LLM 장애 시 TTL이 지난 캐시 결과로 응답 (query_info.stale=True), 없으면 None
+    같은 키의 재검증은 하나만 예약
+    """
+    stale = await get_cached_recommendation(cache_key, allow_stale=True)
+    if stale is None:
+        return None
+    stale.query_info.update({
+        "original_message": request.message,
+        "stale": True,
+        "stale_reason": reason,
+        "llm_error": llm_error,
+        "circuit_state": llm_circuit.state
+    })
+    recommend_stale_stats["served"] += 1
+    if cache_key not in recommend_revalidations:
+        recommend_stale_stats["revalidations"] += 1
+        recommend_revalidations[cache_key] = asyncio.create_task(revalidate_recommendation(request, cache_key))
+    logger.warning(f"♻️ LLM 장애({reason})로 오래된 추천 캐시 응답: '{request.message}' (age: {stale.query_info['cache_age_seconds']}초)")
+    return stale
+
+def get_recommend_stale_stats() -> Dict[str, Any]:
+    return {
+        "stale_window_seconds": RECOMMEND_STALE_WINDOW,
+        **recommend_stale_stats,
+        "pending": len(recommend_revalidations)
+    }
+
+async def fetch_and_cache_recommendation(request: RecommendRequest, cache_key: str) -> RecommendResponse:
+    """
+    LLM 추천 요청 후 성공 시 캐싱 (single-flight leader만 실행)
+    서킷이 열려 있거나 LLM 호출이 실패하면 오래된 캐시 결과 → 로컬 대체 추천 순으로 응답 (대체 결과는 캐싱하지 않음)
+    """
+    if not llm_circuit.allow_request():
+        stale = await serve_stale_recommendation(request, cache_key, "circuit_open")
+        if stale is not None:
+            return stale
+        if LLM_FALLBACK_ENABLED:
+            return build_fallback_recommendation(request, "circuit_open")
+        return RecommendResponse(success=False, error="추천 서버가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해주세요.")
+    
+    result = await fetch_recommendation_from_llm(request)
+    if result.success:
+        await cache_recommendation(cache_key, result)
+        return result
+    stale = await serve_stale_recommendation(request, cache_key, "llm_error", result.error)
+    if stale is not None:
+        return stale
+    if LLM_FALLBACK_ENABLED:
+        return build_fallback_recommendation(request, "llm_error", result.error)
+    return result
+
+async def request_llm_recommendation(request: RecommendRequest) -> Dict[str, Any]:
+    """
+    LLM 서버 /movie-recommend 호출 후 응답 JSON 반환 (서킷 브레이커에 성공/실패 기록)
+    연결 실패는 httpx.HTTPError, 오류 응답은 HTTPException으로 전달
+    """
+    logger.debug(f"🤖 LLM 서버에 영화 추천 요청 전송: {LLM_SERVER_URL}/movie-recommend")
+    client = get_http_client("llm")
+    # LLM 서버의 movie-recommend 엔드포인트 요청 형식
+    llm_request_data = {
+        "message": request.message,
+        "user_id": request.user_id or "anonymous",
+        "context": {
+            "page": request.page,
+            "limit": request.limit
+        }
+    }
+    
+    # 어떤 경로로 끝나든 서킷 브레이커에 결과를 남김 (half_open 시험 슬롯이 묶이지 않도록)
+    llm_started = time.perf_counter()
+    failure_reason: Optional[str] = None
+    try:
+        llm_response = await client.post(
+            f"{LLM_SERVER_URL}/movie-recommend",
+            json=llm_request_data
+        )
+        llm_latency = time.perf_counter() - llm_started
+        
+        logger.debug(f"🤖 LLM 서버 응답 상태: {llm_response.status_code} ({llm_latency:.2f}초)")
+        
+        if llm_response.status_code != 200:
+            failure_reason = f"HTTP {llm_response.status_code}"
+            logger.error(f"❌ LLM 서버 응답 오류: {llm_response.status_code}")
+            raise HTTPException(
+                status_code=500, 
+                detail=f"LLM 서버 응답 오류: {llm_response.status_code}"
             )
-            
-            logger.info(f"🤖 LLM 서버 응답 상태: {llm_response.status_code}")
-            
-            if llm_response.status_code != 200:
-                logger.error(f"❌ LLM 서버 응답 오류: {llm_response.status_code}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"LLM 서버 응답 오류: {llm_response.status_code}"
-                )
-            
+        
+        try:
             llm_data = llm_response.json()
-            logger.info(f"🤖 LLM 영화 추천 결과: success={llm_data.get('success')}")
-            logger.info(f"🤖 LLM 응답 구조: {list(llm_data.keys())}")
-            
-            if not llm_data.get("success", False):
-                logger.error(f"❌ LLM 영화 추천 실패: {llm_data.get('error', 'Unknown error')}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"LLM 영화 추천 실패: {llm_data.get('error', 'Unknown error')}"
-                )
-            
-            # 2. LLM 서버로부터 완성된 영화 데이터 추출 (새로운 형식)
-            movies = llm_data.get("movies", [])
-            pagination = llm_data.get("pagination", {})  # 최상위로 이동됨
-            query_metadata = llm_data.get("query_metadata", {})  # query_info → query_metadata
-            conversation = llm_data.get("conversation", {})  # 새로 추가된 대화형 응답
-            
-            logger.info(f"🎬 LLM에서 받은 영화 개수: {len(movies)}개")
-            logger.info(f"📄 페이지네이션 정보: {pagination}")
-            logger.info(f"💬 대화형 응답 포함: {bool(conversation)}")
-            
-            # 3. 각 영화에 OTT 링크 추가 및 데이터 정제
-            logger.info(f"📋 영화 목록 처리 시작: {len(movies)}개")
-            
-            # 각 영화에 OTT 링크 추가 및 None 값 처리
-            for movie in movies:
-                movie_id = movie.get("id")
-                
-                # None 값들을 안전하게 처리
-                if movie.get("poster_path") is None:
-                    movie["poster_path"] = ""
-                if movie.get("backdrop_path") is None:
-                    movie["backdrop_path"] = ""
-                if movie.get("overview") is None:
-                    movie["overview"] = ""
-                if movie.get("release_date") is None:
-                    movie["release_date"] = ""
-                
-                # OTT 링크 추가
-                if movie_id:
-                    # 로컬 데이터에서 OTT 링크 조회
-                    ott_links = get_ott_links_with_caching(movie_id)
-                    
-                    movie["ott_links"] = ott_links
-                    logger.debug(f"🔗 영화 '{movie.get('title')}' (ID: {movie_id}) OTT 링크: {len(ott_links)}개")
-            
-            # 처리 시간 계산
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
-            logger.info(f"⏱️ 전체 처리 시간: {processing_time:.2f}초")
-            
-            # LLM 서버 응답을 새로운 형식에 맞게 구성 (안전한 영화 객체 생성)
-            valid_movies = []
-            for movie in movies:
-                try:
-                    movie_info = MovieInfo(**movie)
-                    valid_movies.append(movie_info)
-                except Exception as movie_error:
-                    logger.warning(f"⚠️ 영화 데이터 변환 실패: {movie.get('title', 'Unknown')} (ID: {movie.get('id', 'Unknown')}) - {movie_error}")
-                    # 계속 진행 (해당 영화만 제외)
-                    continue
-            
-            logger.info(f"✅ 유효한 영화 데이터: {len(valid_movies)}/{len(movies)}개")
-            
-            result = RecommendResponse(
-                success=True,
-                movies=valid_movies,
-                total_results=pagination.get("total_results", len(movies)),
-                query_info={
-                    "original_message": request.message,
-                    "tmdb_parameters": query_metadata.get("tmdb_parameters", {}),  # parsed_parameters → tmdb_parameters
-                    "confidence": query_metadata.get("confidence", 0.8),  # llm_confidence → confidence
-                    "method": query_metadata.get("method", "movie-recommend"),  # llm_method → method
-                    "reasoning": query_metadata.get("reasoning", ""),
-                    "processing_time_ms": query_metadata.get("processing_time_ms", 0),
-                    "proxy_processing_time_seconds": processing_time,
-                    "pagination": pagination,
-                    "conversation": conversation,  # 새로 추가된 대화형 응답
-                    "user_intent_analysis": conversation.get("user_intent_analysis", ""),
-                    "recommendation_explanation": conversation.get("recommendation_explanation", ""),
-                    "follow_up_suggestions": conversation.get("follow_up_suggestions", "")
-                }
+        except ValueError:
+            failure_reason = "invalid JSON"
+            raise HTTPException(status_code=500, detail="LLM 서버 응답 형식 오류 (JSON 아님)")
+        logger.debug(f"🤖 LLM 영화 추천 결과: success={llm_data.get('success')}")
+        logger.debug(f"🤖 LLM 응답 구조: {list(llm_data.keys())}")
+        
+        if not llm_data.get("success", False):
+            failure_reason = "success=false"
+            logger.error(f"❌ LLM 영화 추천 실패: {llm_data.get('error', 'Unknown error')}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"LLM 영화 추천 실패: {llm_data.get('error', 'Unknown error')}"
             )
-            
-            logger.info(f"✅ 영화 추천 완료: {len(result.movies) if result.movies else 0}개 반환")
-            return result
-            
+    except asyncio.CancelledError:
+        # 결과를 모른 채 취소됨 (스트림 클라이언트 연결 종료 등) → 시험 슬롯만 반환
+        llm_circuit.release()
+        raise
+    except BaseException as e:
+        llm_circuit.record_failure(failure_reason or type(e).__name__, time.perf_counter() - llm_started)
+        raise
+    
+    llm_circuit.record_success(llm_latency)
+    return llm_data
+
+# LLM 응답에서 null/누락일 수 있는 문자열 필드의 기본값
+MOVIE_STRING_DEFAULTS: Dict[str, str] = {"poster_path": "", "backdrop_path": "", "overview": "", "release_date": ""}
+
+def sanitize_movie(movie: Dict[str, Any], ott_links: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """한 번의 순회로 None 값 제거 + 문자열 기본값 + OTT 링크 부착 (원본 dict는 수정하지 않음)"""
+    return {**MOVIE_STRING_DEFAULTS, **{key: value for key, value in movie.items() if value is not None}, "ott_links": ott_links}
+
+def build_movie_infos(movies: List[Dict[str, Any]], ott_links_by_id: Dict[int, Sequence[Dict[str, Any]]]) -> List[MovieInfo]:
+    """
+    LLM 영화 목록 → MovieInfo 목록
+    전체를 한 번에 검증하고, 실패한 경우에만 영화별로 다시 검증해 잘못된 영화만 제외
+    """
+    sanitized = [sanitize_movie(movie, ott_links_by_id.get(movie.get("id"), ())) for movie in movies]
+    try:
+        return movie_list_adapter.validate_python(sanitized)
+    except ValidationError:
+        pass
+    
+    valid_movies = []
+    for movie in sanitized:
+        try:
+            valid_movies.append(MovieInfo.model_validate(movie))
+        except ValidationError as movie_error:
+            logger.warning(f"⚠️ 영화 데이터 변환 실패: {movie.get('title', 'Unknown')} (ID: {movie.get('id', 'Unknown')}) - {movie_error}")
+            # 계속 진행 (해당 영화만 제외)
+            continue
+    return valid_movies
+
+def build_llm_query_info(request: RecommendRequest, llm_data: Dict[str, Any], processing_time: float) -> Dict[str, Any]:
+    """LLM 응답 메타데이터 → RecommendResponse.query_info"""
+    pagination = llm_data.get("pagination", {})  # 최상위로 이동됨
+    query_metadata = llm_data.get("query_metadata", {})  # query_info → query_metadata
+    conversation = llm_data.get("conversation", {})  # 새로 추가된 대화형 응답
+    return {
+        "original_message": request.message,
+        "tmdb_parameters": query_metadata.get("tmdb_parameters", {}),  # parsed_parameters → tmdb_parameters
+        "confidence": query_metadata.get("confidence", 0.8),  # llm_confidence → confidence
+        "method": query_metadata.get("method", "movie-recommend"),  # llm_method → method
+        "reasoning": query_metadata.get("reasoning", ""),
+        "processing_time_ms": query_metadata.get("processing_time_ms", 0),
+        "proxy_processing_time_seconds": processing_time,
+        "pagination": pagination,
+        "conversation": conversation,  # 새로 추가된 대화형 응답
+        "user_intent_analysis": conversation.get("user_intent_analysis", ""),
+        "recommendation_explanation": conversation.get("recommendation_explanation", ""),
+        "follow_up_suggestions": conversation.get("follow_up_suggestions", ""),
+        "degraded": False,
+        "cache_hit": False,
+        "cache_age_seconds": 0
+    }
+
+async def fetch_recommendation_from_llm(request: RecommendRequest) -> RecommendResponse:
+    """LLM 서버에 추천을 요청하고 OTT 링크를 붙여 응답 구성 (캐시 미사용 경로)"""
+    start_time = datetime.now()
+    logger.debug(f"🎬 영화 추천 요청 시작 - 사용자: {request.user_id}, 메시지: '{request.message}'")
+    logger.debug(f"📄 요청 파라미터: page={request.page}, limit={request.limit}")
+    
+    try:
+        # 1. LLM 서버에 완전한 영화 추천 요청 (영화 데이터 포함)
+        llm_data = await request_llm_recommendation(request)
+        
+        # 2. LLM 서버로부터 완성된 영화 데이터 추출 (새로운 형식)
+        movies = llm_data.get("movies", [])
+        pagination = llm_data.get("pagination", {})
+        
+        logger.debug(f"🎬 LLM에서 받은 영화 개수: {len(movies)}개")
+        logger.debug(f"📄 페이지네이션 정보: {pagination}")
+        logger.debug(f"💬 대화형 응답 포함: {bool(llm_data.get('conversation'))}")
+        
+        # 3. 페이지 전체의 OTT 링크를 한 번에 조회 (Redis MGET + 파이프라인 백필) 후 영화 객체 생성
+        ott_links_by_id = await get_ott_links_many([movie.get("id") for movie in movies])
+        valid_movies = build_movie_infos(movies, ott_links_by_id)
+        logger.debug(f"✅ 유효한 영화 데이터: {len(valid_movies)}/{len(movies)}개")
+        
+        # 처리 시간 계산
+        end_time = datetime.now()
+        processing_time = (end_time - start_time).total_seconds()
+        logger.debug(f"⏱️ 전체 처리 시간: {processing_time:.2f}초")
+        
+        result = RecommendResponse(
+            success=True,
+            movies=valid_movies,
+            total_results=pagination.get("total_results", len(movies)),
+            query_info=build_llm_query_info(request, llm_data, processing_time)
+        )
+        
+        logger.info(f"✅ 영화 추천 완료: {len(result.movies) if result.movies else 0}개 반환 ({processing_time:.2f}초)")
+        return result
+        
     except httpx.TimeoutException:
         logger.error("⏰ 서버 응답 시간 초과 (30초)")
         return RecommendResponse(
             success=False,
             error="서버 응답 시간 초과 (30초)"
         )
+    except httpx.HTTPError as e:
+        logger.error(f"❌ LLM 서버 연결 실패: {type(e).__name__}: {e}")
+        return RecommendResponse(
+            success=False,
+            error=f"LLM 서버 연결 실패: {str(e)}"
+        )
     except Exception as e:
         logger.error(f"❌ 영화 추천 처리 중 예외 발생: {str(e)}", exc_info=True)
         return RecommendResponse(
@@ -534,6 +1066,219 @@ async def recommend_movies_for_spring(request: RecommendRequest) -> RecommendRes
             error=f"추천 처리 중 오류 발생: {str(e)}"
         )
 
+# === 스트리밍 추천 (Server-Sent Events) ===
+# 이벤트 순서: params → movies(배치별) → explanation → done (실패 시 error)
+RECOMMEND_STREAM_BATCH_SIZE = int(os.getenv('RECOMMEND_STREAM_BATCH_SIZE', 5))
+RECOMMEND_STREAM_KEEPALIVE = float(os.getenv('RECOMMEND_STREAM_KEEPALIVE', 5))
+recommend_stream_stats: Dict[str, Any] = {
+    "streams": 0, "completed": 0, "errors": 0, "disconnected": 0,
+    "first_content_ms_total": 0.0, "total_ms_total": 0.0, "last_first_content_ms": None, "last_total_ms": None
+}
+
+def sse_event(event: str, data: Any) -> str:
+    """SSE 프레임 (event + 한 줄 JSON data)"""
+    return f"event: {event}\ndata: {fast_json.dumps_str(data)}\n\n"
+
+def stream_params_payload(query_info: Dict[str, Any], total_results: Optional[int]) -> Dict[str, Any]:
+    return {
+        "original_message": query_info.get("original_message"),
+        "tmdb_parameters": query_info.get("tmdb_parameters", {}),
+        "confidence": query_info.get("confidence"),
+        "method": query_info.get("method"),
+        "reasoning": query_info.get("reasoning", ""),
+        "pagination": query_info.get("pagination", {}),
+        "total_results": total_results,
+        "degraded": query_info.get("degraded", False),
+        "cache_hit": query_info.get("cache_hit", False)
+    }
+
+def stream_explanation_payload(query_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "conversation": query_info.get("conversation", {}),
+        "user_intent_analysis": query_info.get("user_intent_analysis", ""),
+        "recommendation_explanation": query_info.get("recommendation_explanation", ""),
+        "follow_up_suggestions": query_info.get("follow_up_suggestions", "")
+    }
+
+async def stream_llm_recommendation(request: RecommendRequest, cache_key: str, timings: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    LLM 응답을 받는 즉시 params 이벤트를 보내고, 영화는 배치별로 OTT 조회/검증 후 전송
+    LLM 대기 중에는 keepalive 주석을 보내 중간 프록시가 연결을 끊거나 버퍼링하지 않게 함
+    """
+    llm_task = asyncio.create_task(request_llm_recommendation(request))
+    try:
+        while not llm_task.done():
+            done, _ = await asyncio.wait({llm_task}, timeout=RECOMMEND_STREAM_KEEPALIVE)
+            if not done:
+                yield ": keepalive\n\n"
+        llm_data = llm_task.result()
+    finally:
+        if not llm_task.done():
+            llm_task.cancel()
+    
+    movies = llm_data.get("movies", [])
+    pagination = llm_data.get("pagination", {})
+    query_info = build_llm_query_info(request, llm_data, 0.0)
+    total_results = pagination.get("total_results", len(movies))
+    timings["mark_first_content"]()
+    yield sse_event("params", stream_params_payload(query_info, total_results))
+    
+    valid_movies: List[MovieInfo] = []
+    for batch_number, offset in enumerate(range(0, len(movies), RECOMMEND_STREAM_BATCH_SIZE), start=1):
+        batch = movies[offset:offset + RECOMMEND_STREAM_BATCH_SIZE]
+        ott_links_by_id = await get_ott_links_many([movie.get("id") for movie in batch])
+        batch_movies = build_movie_infos(batch, ott_links_by_id)
+        valid_movies.extend(batch_movies)
+        yield sse_event("movies", {"batch": batch_number, "movies": [movie.model_dump() for movie in batch_movies]})
+    
+    yield sse_event("explanation", stream_explanation_payload(query_info))
+    
+    # 스트림으로 완성된 결과도 일반 추천 API와 같은 캐시에 저장
+    query_info["proxy_processing_time_seconds"] = time.perf_counter() - timings["started"]
+    await cache_recommendation(cache_key, RecommendResponse(
+        success=True, movies=valid_movies, total_results=total_results, query_info=query_info
+    ))
+
+def stream_movie_payload(movie: Any) -> Dict[str, Any]:
+    """movies 이벤트용 영화 dict (model_construct로 복원한 캐시 응답은 dict가 섞여 있을 수 있음)"""
+    return movie.model_dump() if isinstance(movie, BaseModel) else movie
+
+async def stream_recommend_response(response: RecommendResponse) -> AsyncIterator[str]:
+    """이미 완성된 추천 결과(캐시/대체 추천)를 같은 이벤트 순서로 전송"""
+    query_info = response.query_info or {}
+    yield sse_event("params", stream_params_payload(query_info, response.total_results))
+    movies = response.movies or []
+    for batch_number, offset in enumerate(range(0, len(movies), RECOMMEND_STREAM_BATCH_SIZE), start=1):
+        batch = movies[offset:offset + RECOMMEND_STREAM_BATCH_SIZE]
+        yield sse_event("movies", {"batch": batch_number, "movies": [stream_movie_payload(movie) for movie in batch]})
+    yield sse_event("explanation", stream_explanation_payload(query_info))
+
+async def recommend_event_stream(request: RecommendRequest) -> AsyncIterator[str]:
+    """
+    추천 SSE 스트림 본문 (캐시 → 서킷 확인 → LLM 순, 실패 시 대체 추천 또는 error 이벤트)
+    첫 콘텐츠(params 이벤트)까지의 시간과 전체 시간을 따로 기록해 done 이벤트와 /admin/stats에 노출
+    """
+    started = time.perf_counter()
+    timings: Dict[str, Any] = {"started": started, "first_content": None}
+    
+    def mark_first_content():
+        if timings["first_content"] is None:
+            timings["first_content"] = time.perf_counter() - started
+    timings["mark_first_content"] = mark_first_content
+    
+    recommend_stream_stats["streams"] += 1
+    source = "llm"
+    completed = False
+    try:
+        # 응답 헤더를 즉시 내보내도록 첫 프레임은 주석으로 전송
+        yield ": stream-open\n\n"
+        
+        cache_key = recommend_cache_key(request)
+        cached = await get_cached_recommendation(cache_key)
+        if cached is not None:
+            source = "cache"
+            cached.query_info["original_message"] = request.message
+            mark_first_content()
+            async for frame in stream_recommend_response(cached):
+                yield frame
+        elif not llm_circuit.allow_request():
+            fallback = await serve_stale_recommendation(request, cache_key, "circuit_open")
+            if fallback is not None:
+                source = "stale_cache"
+            elif not LLM_FALLBACK_ENABLED:
+                raise RuntimeError("추천 서버가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해주세요.")
+            else:
+                source = "local_fallback"
+                fallback = build_fallback_recommendation(request, "circuit_open")
+            mark_first_content()
+            async for frame in stream_recommend_response(fallback):
+                yield frame
+        else:
+            try:
+                async for frame in stream_llm_recommendation(request, cache_key, timings):
+                    yield frame
+            except Exception as e:
+                # params 이전에 실패했을 때만 오래된 캐시/대체 추천으로 전환 (이미 보낸 이벤트와 섞이지 않게)
+                if timings["first_content"] is not None:
+                    raise
+                error = e.detail if isinstance(e, HTTPException) else f"LLM 서버 연결 실패: {e}"
+                fallback = await serve_stale_recommendation(request, cache_key, "llm_error", error)
+                if fallback is not None:
+                    source = "stale_cache"
+                elif not LLM_FALLBACK_ENABLED:
+                    raise
+                else:
+                    logger.warning(f"⚠️ 스트리밍 LLM 추천 실패, 로컬 대체 추천 전송: {type(e).__name__}: {e}")
+                    source = "local_fallback"
+                    fallback = build_fallback_recommendation(request, "llm_error", error)
+                mark_first_content()
+                async for frame in stream_recommend_response(fallback):
+                    yield frame
+        completed = True
+    except asyncio.CancelledError:
+        recommend_stream_stats["disconnected"] += 1
+        logger.debug(f"🔌 스트리밍 추천 중 클라이언트 연결 종료: '{request.message}'")
+        raise
+    except Exception as e:
+        recommend_stream_stats["errors"] += 1
+        logger.error(f"❌ 스트리밍 추천 실패: {type(e).__name__}: {e}")
+        yield sse_event("error", {"error": e.detail if isinstance(e, HTTPException) else str(e)})
+    
+    total = time.perf_counter() - started
+    first_content_ms = round(timings["first_content"] * 1000, 1) if timings["first_content"] is not None else None
+    if completed:
+        recommend_stream_stats["completed"] += 1
+        recommend_stream_stats["first_content_ms_total"] += first_content_ms
+        recommend_stream_stats["total_ms_total"] += total * 1000
+        recommend_stream_stats["last_first_content_ms"] = first_content_ms
+        recommend_stream_stats["last_total_ms"] = round(total * 1000, 1)
+    logger.debug(f"📡 스트리밍 추천 종료 ({source}): 첫 콘텐츠 {first_content_ms}ms, 전체 {total * 1000:.1f}ms")
+    yield sse_event("done", {
+        "success": completed,
+        "source": source,
+        "time_to_first_content_ms": first_content_ms,
+        "total_time_ms": round(total * 1000, 1)
+    })
+
+def get_recommend_stream_stats() -> Dict[str, Any]:
+    completed = recommend_stream_stats["completed"]
+    return {
+        "streams": recommend_stream_stats["streams"],
+        "completed": completed,
+        "errors": recommend_stream_stats["errors"],
+        "disconnected": recommend_stream_stats["disconnected"],
+        "avg_time_to_first_content_ms": round(recommend_stream_stats["first_content_ms_total"] / completed, 1) if completed else None,
+        "avg_total_time_ms": round(recommend_stream_stats["total_ms_total"] / completed, 1) if completed else None,
+        "last_time_to_first_content_ms": recommend_stream_stats["last_first_content_ms"],
+        "last_total_time_ms": recommend_stream_stats["last_total_ms"],
+        "batch_size": RECOMMEND_STREAM_BATCH_SIZE
+    }
+
+def recommend_stream_response(request: RecommendRequest) -> StreamingResponse:
+    return StreamingResponse(
+        recommend_event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/movies/recommend/stream")
+async def recommend_movies_stream(request: RecommendRequest) -> StreamingResponse:
+    """
+    영화 추천 스트리밍 API (text/event-stream)
+    경로: /api/movies/recommend/stream, 요청 본문은 /api/movies/recommend와 동일
+    """
+    return recommend_stream_response(request)
+
+@app.get("/api/movies/recommend/stream")
+async def recommend_movies_stream_get(
+    message: str,
+    user_id: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+) -> StreamingResponse:
+    """브라우저 EventSource용 GET 버전 (쿼리 파라미터로 요청)"""
+    return recommend_stream_response(RecommendRequest(message=message, user_id=user_id, page=page, limit=limit))
+
 @app.get("/api/movies/{movie_id}/ott", response_model=OTTLinksResponse)
 async def get_movie_ott_links(movie_id: int) -> OTTLinksResponse:
     """
@@ -541,21 +1286,21 @@ async def get_movie_ott_links(movie_id: int) -> OTTLinksResponse:
     경로: /api/movies/{movie_id}/ott
     Redis 캐싱을 활용하여 빠른 응답 제공
     """
-    logger.info(f"🔗 영화 OTT 링크 조회 요청: 영화 ID {movie_id}")
+    logger.debug(f"🔗 영화 OTT 링크 조회 요청: 영화 ID {movie_id}")
     
     try:
         # 캐싱을 활용한 OTT 링크 조회 (Redis 우선, 로컬 데이터 백업)
-        ott_links = get_ott_links_with_caching(movie_id)
+        ott_links = await get_ott_links_with_caching(movie_id)
         
         if ott_links:
-            logger.info(f"✅ 영화 OTT 링크 조회 성공: 영화 ID {movie_id}, {len(ott_links)}개 링크")
+            logger.debug(f"✅ 영화 OTT 링크 조회 성공: 영화 ID {movie_id}, {len(ott_links)}개 링크")
             return OTTLinksResponse(
                 success=True,
                 movie_id=movie_id,
                 ott_links=ott_links
             )
         else:
-            logger.warning(f"⚠️ 영화 OTT 링크 없음: 영화 ID {movie_id}")
+            logger.debug(f"➖ 영화 OTT 링크 없음: 영화 ID {movie_id}")
             return OTTLinksResponse(
                 success=True,
                 movie_id=movie_id,
@@ -578,21 +1323,21 @@ async def get_tv_ott_links(tv_id: int) -> OTTLinksResponse:
     경로: /api/tv/{tv_id}/ott
     Redis 캐싱을 활용하여 빠른 응답 제공
     """
-    logger.info(f"📺 TV 시리즈 OTT 링크 조회 요청: TV ID {tv_id}")
+    logger.debug(f"📺 TV 시리즈 OTT 링크 조회 요청: TV ID {tv_id}")
     
     try:
-        # 캐싱을 활용한 OTT 링크 조회 (Redis 우선, 로컬 데이터 백업)
-        ott_links = get_ott_links_with_caching(tv_id)
+        # TV 인덱스를 직접 조회 (영화 데이터를 먼저 검색하지 않음)
+        ott_links = await get_ott_links_with_caching(tv_id, media_type="tv")
         
         if ott_links:
-            logger.info(f"✅ TV 시리즈 OTT 링크 조회 성공: TV ID {tv_id}, {len(ott_links)}개 링크")
+            logger.debug(f"✅ TV 시리즈 OTT 링크 조회 성공: TV ID {tv_id}, {len(ott_links)}개 링크")
             return OTTLinksResponse(
                 success=True,
                 movie_id=tv_id,  # movie_id 필드를 재사용 (호환성)
                 ott_links=ott_links
             )
         else:
-            logger.warning(f"⚠️ TV 시리즈 OTT 링크 없음: TV ID {tv_id}")
+            logger.debug(f"➖ TV 시리즈 OTT 링크 없음: TV ID {tv_id}")
             return OTTLinksResponse(
                 success=True,
                 movie_id=tv_id,
@@ -608,35 +1353,77 @@ async def get_tv_ott_links(tv_id: int) -> OTTLinksResponse:
             error=f"TV 시리즈 OTT 링크 조회 중 오류 발생: {str(e)}"
         )
 
+# 배치 OTT 조회 한 번에 받을 수 있는 최대 ID 수 (영화 + TV 합계)
+OTT_BATCH_MAX_IDS = int(os.getenv('OTT_BATCH_MAX_IDS', 100))
+
+@app.post("/api/ott/batch", response_model=OTTBatchResponse)
+async def get_ott_links_batch(request: OTTBatchRequest) -> FastJSONResponse:
+    """
+    Spring 프론트엔드를 위한 OTT 링크 일괄 조회 API (포스터 그리드/캐러셀용)
+    경로: /api/ott/batch
+    영화/TV 각각 캐시 일괄 조회 한 번(L1 → Redis MGET → 로컬 인덱스)으로 처리
+    """
+    movie_ids = list(dict.fromkeys(request.movie_ids))
+    tv_ids = list(dict.fromkeys(request.tv_ids))
+    if len(movie_ids) + len(tv_ids) > OTT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 조회할 수 있는 ID는 최대 {OTT_BATCH_MAX_IDS}개입니다. (요청: {len(movie_ids) + len(tv_ids)}개)"
+        )
+    
+    try:
+        movie_links, tv_links = await asyncio.gather(
+            get_ott_links_many(movie_ids),
+            get_ott_links_many(tv_ids, media_type="tv")
+        )
+        logger.debug(f"🔗 OTT 링크 배치 조회: 영화 {len(movie_ids)}개, TV {len(tv_ids)}개")
+        # 캐시/로컬 인덱스의 정규화된 링크이므로 재검증 없이 구성
+        return FastJSONResponse(OTTBatchResponse.model_construct(
+            success=True,
+            movies={movie_id: list(movie_links.get(movie_id, ())) for movie_id in movie_ids},
+            tv={tv_id: list(tv_links.get(tv_id, ())) for tv_id in tv_ids},
+            missing={
+                "movie": [movie_id for movie_id in movie_ids if not movie_links.get(movie_id)],
+                "tv": [tv_id for tv_id in tv_ids if not tv_links.get(tv_id)]
+            }
+        ))
+        
+    except Exception as e:
+        logger.error(f"❌ OTT 링크 배치 조회 중 예외 발생 (영화 {len(movie_ids)}개, TV {len(tv_ids)}개): {str(e)}", exc_info=True)
+        return OTTBatchResponse(
+            success=False,
+            error=f"OTT 링크 배치 조회 중 오류 발생: {str(e)}"
+        )
+
 @app.get("/api/movies/popular")
 async def get_popular_movies(page: int = 1, limit: int = 20) -> Dict[str, Any]:
     """
     Spring 프론트엔드를 위한 인기 영화 목록 API
     """
-    logger.info(f"🌟 인기 영화 목록 요청: page={page}, limit={limit}")
+    logger.debug(f"🌟 인기 영화 목록 요청: page={page}, limit={limit}")
     
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # API 서버에서 인기 영화 조회
-            logger.info(f"📡 API 서버에 인기 영화 요청: {API_SERVER_URL}/popular")
-            response = await client.get(
-                f"{API_SERVER_URL}/popular",
-                params={"page": page, "limit": limit}
+        client = get_http_client("api")
+        # API 서버에서 인기 영화 조회
+        logger.debug(f"📡 API 서버에 인기 영화 요청: {API_SERVER_URL}/popular")
+        response = await client.get(
+            f"{API_SERVER_URL}/popular",
+            params={"page": page, "limit": limit}
+        )
+        
+        logger.debug(f"📡 API 서버 응답: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = response.json()
+            logger.debug(f"✅ 인기 영화 조회 성공: {len(result.get('movies', []))}개")
+            return result
+        else:
+            logger.error(f"❌ 인기 영화 조회 실패: {response.status_code}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="인기 영화 조회 실패"
             )
             
-            logger.info(f"📡 API 서버 응답: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"✅ 인기 영화 조회 성공: {len(result.get('movies', []))}개")
-                return result
-            else:
-                logger.error(f"❌ 인기 영화 조회 실패: {response.status_code}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="인기 영화 조회 실패"
-                )
-                
     except Exception as e:
         logger.error(f"❌ 인기 영화 조회 중 예외 발생: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -644,17 +1431,73 @@ async def get_popular_movies(page: int = 1, limit: int = 20) -> Dict[str, Any]:
             detail=f"인기 영화 조회 중 오류 발생: {str(e)}"
         )
 
+@app.get("/api/movies/discover")
+async def discover_local_movies(
+    http_request: Request,
+    with_genres: Optional[str] = None,
+    release_date_gte: Optional[str] = Query(None, alias="primary_release_date.gte"),
+    release_date_lte: Optional[str] = Query(None, alias="primary_release_date.lte"),
+    primary_release_year: Optional[int] = None,
+    vote_average_gte: Optional[float] = Query(None, alias="vote_average.gte"),
+    vote_average_lte: Optional[float] = Query(None, alias="vote_average.lte"),
+    sort_by: str = "popularity.desc",
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+) -> Dict[str, Any]:
+    """
+    로컬 영화 카탈로그 discover (TMDB/LLM 호출 없음)
+    TMDB discover와 같은 파라미터 이름 사용, with_genres는 "28,12"(AND) 또는 "28|12"(OR)
+    카탈로그에 인기도가 없으므로 popularity 정렬은 평점순으로 대체
+    지원하지 않는 필터(with_cast 등)는 적용하지 않고 query_info.ignored_params로 알려줌
+    """
+    catalog = local_catalog
+    if catalog is None or catalog.query_engine is None:
+        raise HTTPException(status_code=503, detail="로컬 카탈로그가 아직 로드되지 않았습니다.")
+    
+    params = {
+        key: value for key, value in {
+            "with_genres": with_genres,
+            "primary_release_date.gte": release_date_gte,
+            "primary_release_date.lte": release_date_lte,
+            "primary_release_year": primary_release_year,
+            "vote_average.gte": vote_average_gte,
+            "vote_average.lte": vote_average_lte,
+            "sort_by": sort_by
+        }.items() if value is not None
+    }
+    started = time.perf_counter()
+    slots, total = catalog.query_engine.query(params, offset=(page - 1) * limit, limit=limit)
+    query_time = time.perf_counter() - started
+    ignored_params = catalog.query_engine.unsupported_params(
+        {key: value for key, value in http_request.query_params.items() if key != "limit"}
+    )
+    
+    return {
+        "success": True,
+        "page": page,
+        "total_results": total,
+        "total_pages": (total + limit - 1) // limit,
+        "results": [to_movie_payload(catalog.record_at("movie", slot)) for slot in slots],
+        "query_info": {
+            "parameters": params,
+            "ignored_params": ignored_params,
+            "engine": catalog.query_engine.backend,
+            "query_time_ms": round(query_time * 1000, 3),
+            "catalog_generation": catalog.generation
+        }
+    }
+
 # === 기존 호환성 엔드포인트 ===
 @app.post("/recommend", response_model=RecommendResponse)
-async def recommend_movies_legacy(request: RecommendRequest) -> RecommendResponse:
+async def recommend_movies_legacy(request: RecommendRequest) -> FastJSONResponse:
     """기존 호환성을 위한 엔드포인트"""
-    logger.info("🔄 레거시 추천 엔드포인트 호출 -> 새 엔드포인트로 리다이렉트")
+    logger.debug("🔄 레거시 추천 엔드포인트 호출 -> 새 엔드포인트로 리다이렉트")
     return await recommend_movies_for_spring(request)
 
 @app.get("/view")
 async def get_ott_links_legacy(movieId: int) -> Dict[str, Any]:
     """기존 호환성을 위한 엔드포인트"""
-    logger.info(f"🔄 레거시 OTT 링크 엔드포인트 호출 (movieId: {movieId}) -> 새 엔드포인트로 리다이렉트")
+    logger.debug(f"🔄 레거시 OTT 링크 엔드포인트 호출 (movieId: {movieId}) -> 새 엔드포인트로 리다이렉트")
     result = await get_movie_ott_links(movieId)
     return {
         "success": result.success,
@@ -668,53 +1511,47 @@ async def get_ott_links_legacy(movieId: int) -> Dict[str, Any]:
 @app.get("/healthz")
 async def health_check_cloudtype() -> Dict[str, Any]:
     """Cloudtype용 헬스 체크 (간단 버전)"""
-    logger.info("🏥 Cloudtype 헬스 체크 요청")
+    logger.debug("🏥 Cloudtype 헬스 체크 요청")
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat()
     }
 
 @app.get("/health")
-async def health_check() -> Dict[str, Any]:
-    """상세 헬스 체크"""
-    logger.info("🏥 헬스 체크 요청")
+async def health_check(deep: bool = False) -> Dict[str, Any]:
+    """
+    상세 헬스 체크
+    업스트림 상태는 백그라운드 프로버가 기록한 값으로 즉시 응답, ?deep=1이면 지금 직접 확인
+    """
+    logger.debug("🏥 헬스 체크 요청")
     
     try:
         # Redis 연결 확인
         redis_status = "connected" if redis_available else "disconnected"
         
-        # 외부 서버 연결 확인
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            try:
-                llm_check = await client.get(f"{LLM_SERVER_URL}/health")
-                llm_status = "connected" if llm_check.status_code == 200 else "disconnected"
-                logger.info(f"🤖 LLM 서버 상태: {llm_status}")
-            except:
-                llm_status = "disconnected"
-                logger.warning("⚠️ LLM 서버 연결 실패")
-                
-            try:
-                api_check = await client.get(f"{API_SERVER_URL}/health")
-                api_status = "connected" if api_check.status_code == 200 else "disconnected"
-                logger.info(f"🎥 API 서버 상태: {api_status}")
-            except:
-                api_status = "disconnected"
-                logger.warning("⚠️ API 서버 연결 실패")
+        # 외부 서버 연결 확인 (deep 체크 시에만 실시간 요청)
+        if deep:
+            await asyncio.gather(*(prober.probe_now() for prober in upstream_probers.values()))
+        llm_status = HEALTH_STATUS_LABELS[upstream_probers["llm"].status]
+        api_status = HEALTH_STATUS_LABELS[upstream_probers["api"].status]
         
         health_info = {
             "proxy_server": "running",
             "python_version": "3.12.9",
             "redis": redis_status,
             "llm_server": llm_status,
+            "llm_circuit": llm_circuit.state,
             "api_server": api_status,
             "spring_ready": True,
-            "data_loaded": data_loaded,
-            "movie_count": len(movie_data_cache.get("movies", [])) if movie_data_cache else 0,
-            "tv_count": len(tv_data_cache.get("tv_shows", [])) if tv_data_cache else 0,
+            "data_loaded": local_catalog is not None,
+            "movie_count": catalog_count("movie"),
+            "tv_count": catalog_count("tv"),
+            "upstreams": {name: prober.snapshot() for name, prober in upstream_probers.items()},
+            "deep": deep,
             "timestamp": datetime.now().isoformat()
         }
         
-        logger.info(f"✅ 헬스 체크 완료: {health_info}")
+        logger.debug(f"✅ 헬스 체크 완료: {health_info}")
         return health_info
         
     except Exception as e:
@@ -728,49 +1565,78 @@ async def health_check() -> Dict[str, Any]:
 
 @app.get("/admin/data/reload")
 async def reload_local_data() -> Dict[str, Any]:
-    """관리자용: 로컬 JSON 데이터 재로드"""
+    """
+    관리자용: 로컬 JSON 데이터 재로드
+    빌드는 백그라운드 스레드에서 수행되며, 검증 통과 후 교체될 때까지 기존 카탈로그로 계속 응답
+    공유 모드에서는 새 세대를 발행하며, 다른 워커는 CATALOG_GENERATION_CHECK_INTERVAL 이내에 전환
+    """
     logger.info("🔄 관리자 요청: 로컬 데이터 재로드")
     
-    global data_loaded
-    data_loaded = False
-    
-    success = load_local_data()
+    success = await reload_local_catalog("admin")
     
     return {
         "success": success,
-        "message": "데이터 재로드 완료" if success else "데이터 재로드 실패",
-        "movie_count": len(movie_data_cache.get("movies", [])) if movie_data_cache else 0,
-        "tv_count": len(tv_data_cache.get("tv_shows", [])) if tv_data_cache else 0,
+        "message": "데이터 재로드 완료" if success else "데이터 재로드 실패 (기존 카탈로그 유지)",
+        "generation": catalog_reload_stats["generation"],
+        "build_seconds": catalog_reload_stats["build_seconds"],
+        "error": catalog_reload_stats["last_error"],
+        "movie_count": catalog_count("movie"),
+        "tv_count": catalog_count("tv"),
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/admin/logging")
+async def get_logging_config() -> Dict[str, Any]:
+    """관리자용: 현재 로그 레벨/샘플링/제한 통계"""
+    return get_logging_stats()
+
+@app.post("/admin/logging")
+async def update_log_level(level: str, logger_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    관리자용: 재시작 없이 로그 레벨 변경 (예: POST /admin/logging?level=DEBUG&logger_name=main)
+    요청을 받은 워커 프로세스에만 적용
+    """
+    try:
+        result = set_log_level(level, logger_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.warning(f"🔧 로그 레벨 변경: {result['logger']} {result['previous']} → {result['level']}")
+    return {"success": True, **result, "timestamp": datetime.now().isoformat()}
+
 @app.get("/admin/stats")
 async def get_system_stats() -> Dict[str, Any]:
     """
     관리자용: 시스템 통계
     """
-    logger.info("📊 시스템 통계 요청")
+    logger.debug("📊 시스템 통계 요청")
     
     try:
         # 로컬 데이터 통계
         local_stats = {
-            "data_loaded": data_loaded,
-            "movie_count": len(movie_data_cache.get("movies", [])) if movie_data_cache else 0,
-            "tv_count": len(tv_data_cache.get("tv_shows", [])) if tv_data_cache else 0,
+            "data_loaded": local_catalog is not None,
+            "movie_count": catalog_count("movie"),
+            "tv_count": catalog_count("tv"),
             "data_files": {
-                "movie_file_exists": Path("data/movie/tmdb_movies_hybrid_final.json").exists(),
-                "tv_file_exists": Path("data/tv series/tmdb_tv_series_final.json").exists()
-            }
+                "movie_file_exists": Path(MOVIES_DATA_FILE).exists(),
+                "tv_file_exists": Path(TV_DATA_FILE).exists(),
+                "snapshot_exists": Path(CATALOG_SNAPSHOT_FILE).exists()
+            },
+            "backend": local_catalog.backend if local_catalog is not None else None,
+            "query_engine": local_catalog.query_engine.get_stats() if local_catalog is not None and local_catalog.query_engine else None,
+            "load_stats": local_catalog.load_stats if local_catalog is not None else {},
+            "reload": catalog_reload_stats,
+            "shared": shared_catalog_store.get_stats() if shared_catalog_store else None
         }
         
         # Redis 통계
         try:
             if redis_available and redis_client:
-                redis_info = redis_client.info()
+                redis_info = await redis_client.info()
                 redis_stats = {
                     "connected": True,
-                    "total_keys": redis_client.dbsize(),
-                    "used_memory": redis_info.get("used_memory_human", "unknown")
+                    "total_keys": await redis_client.dbsize(),
+                    "used_memory": redis_info.get("used_memory_human", "unknown"),
+                    "pool": redis_client.get_pool_stats()
                 }
             else:
                 redis_stats = {"connected": False}
@@ -779,13 +1645,13 @@ async def get_system_stats() -> Dict[str, Any]:
         
         # API 서버 통계
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{API_SERVER_URL}/stats")
-                
-                if response.status_code == 200:
-                    api_stats = response.json()
-                else:
-                    api_stats = {"error": "API 서버 통계 조회 실패"}
+            client = get_http_client("api")
+            response = await client.get(f"{API_SERVER_URL}/stats", timeout=10.0)
+            
+            if response.status_code == 200:
+                api_stats = response.json()
+            else:
+                api_stats = {"error": "API 서버 통계 조회 실패"}
         except:
             api_stats = {"error": "API 서버 연결 실패"}
         
@@ -797,10 +1663,24 @@ async def get_system_stats() -> Dict[str, Any]:
             },
             "local_data": local_stats,
             "redis": redis_stats,
+            "ott_cache": {
+                "l1": ott_l1_cache.get_stats(),
+                "negative": {
+                    "ttl_seconds": OTT_NEGATIVE_CACHE_TTL,
+                    **ott_negative_stats
+                }
+            },
+            "recommend_single_flight": recommend_single_flight.get_stats(),
+            "llm_circuit": llm_circuit.get_stats(),
+            "recommend_stale": get_recommend_stale_stats(),
+            "recommend_stream": get_recommend_stream_stats(),
+            "serialization": get_serialization_stats(),
+            "http_pools": get_http_pool_stats(),
+            "logging": get_logging_stats(),
             "api_server": api_stats
         }
         
-        logger.info(f"📊 시스템 통계 완료: {result}")
+        logger.debug(f"📊 시스템 통계 완료: {result}")
         return result
             
     except Exception as e:
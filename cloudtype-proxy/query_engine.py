@@ -0,0 +1,202 @@
+"""
+로컬 영화 카탈로그용 컬럼형 쿼리 엔진
+
+카탈로그 로드 시 영화 레코드를 컬럼(ID, 개봉일, 평점, 장르 비트마스크, 제목 순위)으로 변환해 두고,
+LLM이 만드는 TMDB discover 파라미터를 불리언 마스크와 argsort로 처리합니다.
+numpy가 없으면 같은 컬럼을 파이썬 리스트로 두고 순수 파이썬으로 처리합니다.
+
+지원 파라미터:
+    with_genres                 장르 ID/이름 목록, "28,12"(AND) 또는 "28|12"(OR)
+    primary_release_date.gte/lte, release_date.gte/lte, primary_release_year
+    vote_average.gte/lte
+    sort_by                     popularity | vote_average | release_date | primary_release_date | title (.asc/.desc)
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pip install numpy 권장, 없으면 순수 파이썬 경로 사용
+    np = None
+
+# 카탈로그 장르 이름 → TMDB 장르 ID
+GENRE_IDS: Dict[str, int] = {
+    "액션": 28, "모험": 12, "애니메이션": 16, "코미디": 35, "범죄": 80,
+    "다큐멘터리": 99, "드라마": 18, "가족": 10751, "판타지": 14, "역사": 36,
+    "공포": 27, "음악": 10402, "미스터리": 9648, "로맨스": 10749, "SF": 878,
+    "TV 영화": 10770, "스릴러": 53, "전쟁": 10752, "서부": 37
+}
+
+# 장르 ID → 비트 위치
+GENRE_BITS: Dict[int, int] = {genre_id: bit for bit, genre_id in enumerate(sorted(set(GENRE_IDS.values())))}
+
+SUPPORTED_PARAMS = {
+    "with_genres", "primary_release_date.gte", "primary_release_date.lte", "release_date.gte",
+    "release_date.lte", "primary_release_year", "vote_average.gte", "vote_average.lte", "sort_by"
+}
+# 쿼리와 무관한 공통 파라미터 (unsupported로 보고하지 않음)
+PASSTHROUGH_PARAMS = {"language", "page", "include_adult", "region"}
+
+
+def _date_to_int(value: Any) -> int:
+    """'2019-05-30' → 20190530 (빈 값/형식 오류는 0)"""
+    if not value:
+        return 0
+    try:
+        return int(str(value)[:10].replace("-", ""))
+    except ValueError:
+        return 0
+
+
+def parse_genre_filter(value: Any) -> Tuple[int, bool]:
+    """with_genres 값 → (비트마스크, OR 여부). 리스트/쉼표는 AND, 파이프는 OR"""
+    if value is None or value == "":
+        return 0, False
+    if isinstance(value, (list, tuple, set)):
+        tokens, match_any = [str(v) for v in value], False
+    else:
+        text = str(value)
+        match_any = "|" in text
+        tokens = text.replace("|", ",").split(",")
+
+    mask = 0
+    for token in (t.strip() for t in tokens):
+        if not token:
+            continue
+        genre_id = int(token) if token.lstrip("-").isdigit() else GENRE_IDS.get(token)
+        if genre_id not in GENRE_BITS:
+            # 카탈로그에 없는 장르: AND면 결과 없음, OR면 무시
+            if not match_any:
+                return -1, False
+            continue
+        mask |= 1 << GENRE_BITS[genre_id]
+    return mask, match_any
+
+
+class CatalogQueryEngine:
+    """영화 카탈로그 컬럼 + discover 파라미터 실행기 (불변, 카탈로그와 함께 교체)"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        ids: List[int] = []
+        release: List[int] = []
+        votes: List[float] = []
+        genres: List[int] = []
+        titles: List[str] = []
+        for record in records:
+            ids.append(record.get("tmdb_id") or record.get("id") or 0)
+            release.append(_date_to_int(record.get("release_date")))
+            votes.append(float(record.get("vote_average") or 0.0))
+            mask = 0
+            for name in record.get("genres", ()):
+                genre_id = GENRE_IDS.get(name)
+                if genre_id is not None:
+                    mask |= 1 << GENRE_BITS[genre_id]
+            genres.append(mask)
+            titles.append(record.get("title") or "")
+
+        self.size = len(ids)
+        title_order = sorted(range(self.size), key=titles.__getitem__)
+        title_rank = [0] * self.size
+        for rank, slot in enumerate(title_order):
+            title_rank[slot] = rank
+
+        self.backend = "numpy" if np is not None else "python"
+        if np is not None:
+            self.ids = np.asarray(ids, dtype=np.int64)
+            self.release = np.asarray(release, dtype=np.int32)
+            self.votes = np.asarray(votes, dtype=np.float64)
+            self.genres = np.asarray(genres, dtype=np.uint32)
+            self.title_rank = np.asarray(title_rank, dtype=np.int32)
+        else:
+            self.ids, self.release, self.votes, self.genres, self.title_rank = ids, release, votes, genres, title_rank
+
+    @staticmethod
+    def unsupported_params(params: Dict[str, Any]) -> List[str]:
+        return sorted(key for key in params if key not in SUPPORTED_PARAMS and key not in PASSTHROUGH_PARAMS)
+
+    @staticmethod
+    def _bounds(params: Dict[str, Any]) -> Dict[str, Any]:
+        """파라미터 → 비교용 경계값 (날짜는 YYYYMMDD 정수)"""
+        date_gte = _date_to_int(params.get("primary_release_date.gte") or params.get("release_date.gte"))
+        date_lte = _date_to_int(params.get("primary_release_date.lte") or params.get("release_date.lte"))
+        year = params.get("primary_release_year")
+        if year:
+            date_gte = max(date_gte, int(year) * 10000 + 101)
+            date_lte = min(date_lte or 99991231, int(year) * 10000 + 1231)
+        vote_gte = params.get("vote_average.gte")
+        vote_lte = params.get("vote_average.lte")
+        return {
+            "date_gte": date_gte,
+            "date_lte": date_lte,
+            "vote_gte": float(vote_gte) if vote_gte not in (None, "") else None,
+            "vote_lte": float(vote_lte) if vote_lte not in (None, "") else None
+        }
+
+    def _sort_column(self, sort_by: str):
+        """정렬 컬럼 (카탈로그에 인기도가 없으므로 popularity는 평점으로 대체)"""
+        field, _, direction = (sort_by or "popularity.desc").partition(".")
+        if field in ("release_date", "primary_release_date"):
+            column = self.release
+        elif field in ("title", "original_title"):
+            column = self.title_rank
+        else:
+            column = self.votes
+        return column, direction != "asc"
+
+    def query(self, params: Dict[str, Any], offset: int = 0, limit: int = 20) -> Tuple[List[int], int]:
+        """조건에 맞는 레코드 슬롯 번호 (정렬 후 offset부터 limit개), 전체 결과 수"""
+        genre_mask, match_any = parse_genre_filter(params.get("with_genres"))
+        if genre_mask < 0:
+            return [], 0
+        bounds = self._bounds(params)
+        column, descending = self._sort_column(params.get("sort_by", "popularity.desc"))
+        if np is not None:
+            return self._query_numpy(genre_mask, match_any, bounds, column, descending, offset, limit)
+        return self._query_python(genre_mask, match_any, bounds, column, descending, offset, limit)
+
+    def _query_numpy(self, genre_mask, match_any, bounds, column, descending, offset, limit):
+        mask = np.ones(self.size, dtype=bool)
+        if genre_mask:
+            hits = self.genres & np.uint32(genre_mask)
+            mask &= (hits != 0) if match_any else (hits == genre_mask)
+        if bounds["date_gte"]:
+            mask &= self.release >= bounds["date_gte"]
+        if bounds["date_lte"]:
+            mask &= (self.release <= bounds["date_lte"]) & (self.release > 0)
+        if bounds["vote_gte"] is not None:
+            mask &= self.votes >= bounds["vote_gte"]
+        if bounds["vote_lte"] is not None:
+            mask &= self.votes <= bounds["vote_lte"]
+
+        slots = np.flatnonzero(mask)
+        keys = column[slots]
+        # 안정 정렬로 동점은 카탈로그 순서 유지 (내림차순은 부호 반전)
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        return slots[order[offset:offset + limit]].tolist(), int(slots.size)
+
+    def _query_python(self, genre_mask, match_any, bounds, column, descending, offset, limit):
+        slots = []
+        for slot in range(self.size):
+            if genre_mask:
+                hits = self.genres[slot] & genre_mask
+                if (hits == 0) if match_any else (hits != genre_mask):
+                    continue
+            release = self.release[slot]
+            if bounds["date_gte"] and release < bounds["date_gte"]:
+                continue
+            if bounds["date_lte"] and (release > bounds["date_lte"] or release == 0):
+                continue
+            vote = self.votes[slot]
+            if bounds["vote_gte"] is not None and vote < bounds["vote_gte"]:
+                continue
+            if bounds["vote_lte"] is not None and vote > bounds["vote_lte"]:
+                continue
+            slots.append(slot)
+        slots.sort(key=lambda slot: -column[slot] if descending else column[slot])
+        return slots[offset:offset + limit], len(slots)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"backend": self.backend, "movies": self.size}
+        if np is not None:
+            stats["column_bytes"] = int(sum(c.nbytes for c in (self.ids, self.release, self.votes, self.genres, self.title_rank)))
+        return stats
@@ -65,6 +65,13 @@ def check_data_files() -> bool:
         print(f"❌ TV 시리즈 데이터 파일 없음: {tv_file}")
         files_status.append(False)
     
+    snapshot_file = Path(os.getenv('CATALOG_SNAPSHOT_FILE', './data/catalog.snapshot'))
+    if snapshot_file.exists():
+        size_kb = snapshot_file.stat().st_size / 1024
+        print(f"✅ 카탈로그 스냅샷: {snapshot_file} ({size_kb:.1f}KB)")
+    else:
+        print(f"💡 카탈로그 스냅샷 없음 (JSON 원본 사용): python catalog.py compile 로 생성 가능")
+    
     return all(files_status)
 
 async def check_external_services() -> List[bool]:
@@ -310,13 +317,15 @@ async def main() -> None:
             print("   python main.py")
             return
         
-        # 프로덕션 환경에서만 uvicorn.run 실행
+        # 프로덕션 환경에서만 uvicorn.run 실행 (reload 모드에서는 워커 1개)
+        reload = os.getenv('DEBUG', 'false').lower() == 'true'
         uvicorn.run(
             "main:app",
             host=os.getenv('HOST', '0.0.0.0'),
             port=int(os.getenv('PORT', 8000)),
             log_level=os.getenv('LOG_LEVEL', 'info').lower(),
-            reload=os.getenv('DEBUG', 'false').lower() == 'true',
+            reload=reload,
+            workers=None if reload else int(os.getenv('WEB_CONCURRENCY', 1)),
             access_log=True
         )
     except ImportError:
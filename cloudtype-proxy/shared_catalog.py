@@ -0,0 +1,329 @@
+"""
+여러 uvicorn 워커가 공유하는 메모리 매핑(mmap) 카탈로그
+
+카탈로그를 세대(generation) 단위의 읽기 전용 바이너리 파일로 발행하고, 모든 워커는 같은 파일을
+mmap으로 매핑합니다. 페이지 캐시를 공유하므로 워커 수가 늘어도 카탈로그 메모리는 한 벌만 사용합니다.
+
+파일 구성 (CATALOG_SHARED_DIR):
+    CURRENT                 현재 세대 번호 (임시 파일 작성 후 os.replace로 원자적 교체)
+    catalog.gen-<N>.bin     세대별 카탈로그 (발행 후 수정하지 않음)
+    publish.lock            발행 직렬화용 파일 락
+
+세대 파일 레이아웃:
+    magic(8) | header_len(uint32) | header JSON | 8바이트 정렬 패딩 | 섹션들
+    header JSON에는 원본 JSON 서명(sources)을 기록해 재시작 시 원본이 바뀐 세대를 재사용하지 않음
+    종류(movie/tv)별 섹션: 정렬된 ID(int64) | ID별 레코드 번호(uint32) | 레코드 오프셋(uint64, n+1) | 레코드 JSON
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from catalog import content_version, sources_unchanged
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OCCATLG1"
+LAYOUT_VERSION = 1
+KINDS = (("movie", "movies", "movie_index"), ("tv", "tv_shows", "tv_index"))
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "publish.lock"
+GENERATION_PREFIX = "catalog.gen-"
+
+
+def _generation_path(directory: Path, generation: int) -> Path:
+    return directory / f"{GENERATION_PREFIX}{generation}.bin"
+
+
+def _align8(length: int) -> int:
+    return (length + 7) & ~7
+
+
+def _encode_kind(records: List[Dict[str, Any]], index: Dict[int, Dict[str, Any]]) -> Tuple[List[bytes], Dict[str, int]]:
+    """한 종류(movie/tv)의 레코드와 ID 인덱스를 바이트 청크 목록으로 직렬화"""
+    position = {id(record): i for i, record in enumerate(records)}
+    ids = sorted(index)
+    id_array = array("q", ids)
+    slot_array = array("I", (position[id(index[record_id])] for record_id in ids))
+
+    blobs = [json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for record in records]
+    offsets = array("Q", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    chunks = [id_array.tobytes(), slot_array.tobytes(), offsets.tobytes(), b"".join(blobs)]
+    meta = {"records": len(records), "ids": len(ids)}
+    return chunks, meta
+
+
+def _encode_generation(catalog: Dict[str, Any], generation: int) -> bytes:
+    """카탈로그(load_catalog 결과) → 세대 파일 바이트"""
+    sections: Dict[str, Dict[str, Any]] = {}
+    body: List[bytes] = []
+    cursor = 0
+    for kind, records_key, index_key in KINDS:
+        chunks, meta = _encode_kind(catalog[records_key], catalog[index_key])
+        offsets = []
+        for chunk in chunks:
+            offsets.append(cursor)
+            padded = _align8(len(chunk))
+            body.append(chunk + b"\0" * (padded - len(chunk)))
+            cursor += padded
+        meta.update(ids_at=offsets[0], slots_at=offsets[1], offsets_at=offsets[2], data_at=offsets[3])
+        sections[kind] = meta
+
+    header = json.dumps({
+        "layout": LAYOUT_VERSION,
+        "generation": generation,
+        "published_at": time.time(),
+        "load_stats": catalog.get("load_stats", {}),
+        "sources": catalog.get("sources", {}),
+        "sections": sections
+    }).encode("utf-8")
+    prefix_length = _align8(len(MAGIC) + 4 + len(header))
+    prefix = MAGIC + len(header).to_bytes(4, "little") + header
+    return prefix + b"\0" * (prefix_length - len(prefix)) + b"".join(body)
+
+
+def _decode_header(view: Any, path: Path) -> Tuple[Dict[str, Any], int]:
+    """세대 파일 앞부분 → (header, header 끝 위치), 형식이 아니면 ValueError"""
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"카탈로그 세대 파일 형식 아님: {path}")
+    header_length = int.from_bytes(view[len(MAGIC):len(MAGIC) + 4], "little")
+    header_start = len(MAGIC) + 4
+    return json.loads(bytes(view[header_start:header_start + header_length])), header_start + header_length
+
+
+def read_generation_header(path: Path) -> Dict[str, Any]:
+    """세대 파일 header만 읽기 (매핑하지 않음)"""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        header_length = int.from_bytes(prefix[len(MAGIC):], "little")
+        header, _ = _decode_header(prefix + f.read(header_length), path)
+    return header
+
+
+class MappedCatalog:
+    """
+    mmap으로 매핑된 단일 세대 카탈로그 (읽기 전용, catalog.Catalog와 같은 조회 인터페이스)
+    ID 조회는 정렬된 ID 배열 이진 탐색, 레코드는 조회 시점에 해당 구간만 디코딩
+    """
+
+    backend = "mmap"
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        header, header_end = _decode_header(view, path)
+        if header.get("layout") != LAYOUT_VERSION:
+            raise ValueError(f"카탈로그 세대 파일 레이아웃 불일치: {header.get('layout')}")
+
+        self.generation: int = header["generation"]
+        self.published_at: float = header["published_at"]
+        self.load_stats: Dict[str, Any] = header.get("load_stats", {})
+        self.sources: Dict[str, Any] = header.get("sources", {})
+        self.version = content_version(self.sources)
+        # 영화 컬럼형 쿼리 엔진 (워커별로 생성, 컬럼만 보관하므로 크기가 작음)
+        self.query_engine = None
+        base = _align8(header_end)
+
+        self._sections: Dict[str, Tuple[memoryview, memoryview, memoryview, memoryview]] = {}
+        for kind, _, _ in KINDS:
+            meta = header["sections"][kind]
+            id_count, record_count = meta["ids"], meta["records"]
+            ids_at, slots_at = base + meta["ids_at"], base + meta["slots_at"]
+            offsets_at, data_at = base + meta["offsets_at"], base + meta["data_at"]
+            self._sections[kind] = (
+                view[ids_at:ids_at + id_count * 8].cast("q"),
+                view[slots_at:slots_at + id_count * 4].cast("I"),
+                view[offsets_at:offsets_at + (record_count + 1) * 8].cast("Q"),
+                view[data_at:]
+            )
+
+    def _decode(self, kind: str, slot: int) -> Dict[str, Any]:
+        _, _, offsets, data = self._sections[kind]
+        return json.loads(bytes(data[offsets[slot]:offsets[slot + 1]]))
+
+    def get(self, kind: str, record_id: int) -> Optional[Dict[str, Any]]:
+        ids, slots, _, _ = self._sections[kind]
+        i = bisect.bisect_left(ids, record_id)
+        if i < len(ids) and ids[i] == record_id:
+            return self._decode(kind, slots[i])
+        return None
+
+    def count(self, kind: str) -> int:
+        return len(self._sections[kind][2]) - 1
+
+    def record_at(self, kind: str, slot: int) -> Dict[str, Any]:
+        return self._decode(kind, slot)
+
+    def records(self, kind: str) -> Iterator[Dict[str, Any]]:
+        for slot in range(self.count(kind)):
+            yield self._decode(kind, slot)
+
+    @property
+    def built_at(self) -> float:
+        return self.published_at
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._mmap)
+
+
+class SharedCatalogStore:
+    """
+    세대 발행/구독 관리
+    - publish(): 새 세대 파일을 쓴 뒤 CURRENT를 원자적으로 교체 (워커 간 파일 락으로 직렬화)
+    - refresh(): CURRENT가 바뀌었으면 새 세대를 매핑해 current 참조를 한 번에 교체
+    교체 전 세대는 참조가 남아 있는 동안(진행 중인 요청) 계속 유효하며, 오래된 파일은 발행 시 정리
+    """
+
+    def __init__(self, directory: Path, keep_generations: int = 3):
+        self.directory = directory
+        self.keep_generations = max(2, keep_generations)
+        self.current: Optional[MappedCatalog] = None
+        self._current_stamp: Optional[Tuple[int, int]] = None
+        self.swaps = 0
+
+    @classmethod
+    def from_env(cls) -> "SharedCatalogStore":
+        return cls(
+            directory=Path(os.getenv('CATALOG_SHARED_DIR', 'data/shared')),
+            keep_generations=int(os.getenv('CATALOG_SHARED_KEEP', 3))
+        )
+
+    def _read_current_generation(self) -> Optional[int]:
+        try:
+            return int((self.directory / CURRENT_FILE).read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _current_file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = (self.directory / CURRENT_FILE).stat()
+            return stat.st_mtime_ns, stat.st_ino
+        except OSError:
+            return None
+
+    def _lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.directory / LOCK_FILE, "a+")
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return lock_file
+
+    def _publish_locked(self, catalog: Dict[str, Any]) -> int:
+        previous = self._read_current_generation() or 0
+        generation = max(previous + 1, time.time_ns() // 1_000_000)
+        path = _generation_path(self.directory, generation)
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_encode_generation(catalog, generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        current_tmp = self.directory / (CURRENT_FILE + ".tmp")
+        current_tmp.write_text(str(generation))
+        os.replace(current_tmp, self.directory / CURRENT_FILE)
+
+        self._prune(generation)
+        logger.info(f"📦 공유 카탈로그 세대 발행: {generation} ({path.stat().st_size / 1024:.1f}KB, pid {os.getpid()})")
+        return generation
+
+    def publish(self, catalog: Dict[str, Any]) -> int:
+        """새 세대 발행 후 세대 번호 반환 (이 프로세스는 즉시 새 세대로 교체, 나머지 워커는 refresh 시 교체)"""
+        with self._lock():
+            generation = self._publish_locked(catalog)
+        self.refresh()
+        return generation
+
+    def _stale_reason(self, source_paths: Dict[str, Path]) -> Optional[str]:
+        """현재 세대를 그대로 쓸 수 없는 이유 (쓸 수 있으면 None)"""
+        generation = self._read_current_generation()
+        if generation is None:
+            return "발행된 세대 없음"
+        try:
+            header = read_generation_header(_generation_path(self.directory, generation))
+        except (OSError, ValueError) as e:
+            return f"세대 {generation} 읽기 실패 ({e})"
+        if header.get("layout") != LAYOUT_VERSION:
+            return f"세대 {generation} 레이아웃 불일치 ({header.get('layout')} != {LAYOUT_VERSION})"
+        if not sources_unchanged(header.get("sources"), source_paths):
+            return f"세대 {generation} 이후 원본 JSON 변경"
+        return None
+
+    def ensure_published(self, build: Callable[[], Dict[str, Any]], source_paths: Dict[str, Path]) -> Optional[MappedCatalog]:
+        """
+        현재 세대가 없거나, 읽을 수 없거나, 원본 JSON(source_paths)이 발행 이후 바뀌었을 때만
+        build()로 만들어 발행한 뒤 현재 세대를 매핑
+        여러 워커가 동시에 시작해도 락 안에서 다시 확인하므로 빌드는 한 번만 실행
+        """
+        with self._lock():
+            reason = self._stale_reason(source_paths)
+            if reason is not None:
+                logger.info(f"📦 공유 카탈로그 재발행: {reason}")
+                self._publish_locked(build())
+        return self.refresh()
+
+    def _prune(self, newest: int):
+        """최근 keep_generations개를 제외한 세대 파일 삭제 (매핑 중인 워커는 unlink 후에도 계속 읽을 수 있음)"""
+        generations = []
+        for path in self.directory.glob(f"{GENERATION_PREFIX}*.bin"):
+            try:
+                generations.append((int(path.stem[len(GENERATION_PREFIX):]), path))
+            except ValueError:
+                continue
+        for generation, path in sorted(generations, reverse=True)[self.keep_generations:]:
+            if generation != newest:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def refresh(self) -> Optional[MappedCatalog]:
+        """CURRENT가 바뀌었으면 새 세대로 교체 (변경 없으면 stat 한 번으로 끝남)"""
+        stamp = self._current_file_stamp()
+        if stamp is None or (stamp == self._current_stamp and self.current is not None):
+            return self.current
+        generation = self._read_current_generation()
+        if generation is None:
+            return self.current
+        if self.current is None or self.current.generation != generation:
+            mapped = MappedCatalog(_generation_path(self.directory, generation))
+            previous = self.current
+            self.current = mapped
+            self.swaps += 1
+            logger.info(
+                f"🔁 공유 카탈로그 세대 전환: {previous.generation if previous else '-'} → {generation} "
+                f"(pid {os.getpid()})"
+            )
+        self._current_stamp = stamp
+        return self.current
+
+    def get_stats(self) -> Dict[str, Any]:
+        current = self.current
+        return {
+            "directory": str(self.directory),
+            "generation": current.generation if current else None,
+            "published_at": current.published_at if current else None,
+            "mapped_bytes": current.size_bytes if current else 0,
+            "swaps": self.swaps,
+            "pid": os.getpid()
+        }
@@ -3,9 +3,15 @@ from pydantic import BaseModel
 import json
 import os
 from datetime import datetime
+from fast_json import FastJSONResponse, TimedRoute, get_serialization_stats
 from model import MovieRecommendationLLM
 
-app = FastAPI(title="OpusCine LLM Server", version="1.0.0")
+app = FastAPI(
+    title="OpusCine LLM Server",
+    version="1.0.0",
+    default_response_class=FastJSONResponse  # orjson 직렬화 + 직렬화 시간 측정
+)
+app.router.route_class = TimedRoute  # 직렬화 시간에 FastAPI 응답 검증/변환 단계 포함
 
 # LLM 모델 초기화
 llm_model = MovieRecommendationLLM()
@@ -38,11 +44,12 @@ async def process_natural_language(request: LLMRequest):
         # LLM 모델을 통해 자연어를 TMDB 파라미터로 변환
         result = llm_model.parse_movie_request(request.message)
         
-        return LLMResponse(
+        # 모델이 만든 값을 그대로 담으므로 재검증 없이 바로 직렬화
+        return FastJSONResponse(LLMResponse.model_construct(
             success=True,
             parameters=result["parameters"],
             confidence=result.get("confidence", 0.8)
-        )
+        ))
         
     except Exception as e:
         return LLMResponse(
@@ -60,6 +67,7 @@ async def health_check():
             "llm_server": "running",
             "model_status": model_status,
             "model_name": llm_model.model_name,
+            "serialization": get_serialization_stats(),
             "timestamp": datetime.now().isoformat()
         }
         